@@ -4,7 +4,7 @@ import sys
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTextEdit, QPushButton, QRadioButton,
     QVBoxLayout, QWidget, QDialog, QComboBox, QSlider, QLabel,
-    QHBoxLayout, QLineEdit, QColorDialog
+    QHBoxLayout, QLineEdit, QColorDialog, QFileDialog, QScrollBar, QAction
 )
 from PyQt5.QtGui import QTextCursor, QTextCharFormat, QColor, QPalette, QFont
 from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, QObject
@@ -17,8 +17,53 @@ from tts_wrapper import (
 )
 import json
 import wave
+import numpy as np
 import pyaudio
 import difflib
+import re
+import time
+import base64
+import argparse
+import threading
+import io
+import copy
+import queue
+import pstats
+import cProfile
+import marshal
+import zlib
+import hashlib
+import zipfile
+import warnings
+import platform
+import unicodedata
+import tracemalloc
+import contextlib
+import struct
+import mmap
+import tempfile
+import collections
+import multiprocessing
+from concurrent.futures import Future
+from array import array
+from bisect import bisect_left, bisect_right
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        import audioop
+except ImportError:
+    audioop = None
+
+# Splits text into sentence-sized spans for chunked synthesis and streaming
+SENTENCE_RE = re.compile(r'[^\s.!?][^.!?\n]*(?:[.!?]+["\'\u201d\u2019)\]]*|(?=\n)|\Z)|[.!?]+')
+# Spoken words, ignoring surrounding punctuation
+WORD_RE = re.compile(r"\w[\w'\u2019-]*")
 
 def setup_logging():
     logging.basicConfig(
@@ -30,59 +75,1047 @@ def setup_logging():
         ]
     )
 
+class DocumentSource():
+    """A UTF-8 text file read through mmap and decoded one window at a time.
+
+    Nothing holds the whole decoded text, so memory stays flat however large
+    the file is. Positions are byte offsets into the file, moved back to a
+    character boundary so every window decodes on its own. CRLF is folded to
+    LF as QTextEdit does, so char offsets match what the editor shows.
+    """
+
+    def __init__(self, path, window=256 * 1024):
+        self.path = path
+        self.window = window
+        self.file = open(path, 'rb')
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self.start = 3 if self.map[:3] == b'\xef\xbb\xbf' else 0
+
+    def boundary(self, offset):
+        """Nearest UTF-8 character start at or before offset"""
+        offset = max(self.start, min(offset, self.size))
+        while self.start < offset < self.size and self.map[offset] & 0xC0 == 0x80:
+            offset -= 1
+        if self.start < offset < self.size and self.map[offset - 1:offset + 1] == b'\r\n':
+            offset -= 1  # Keep CRLF in one window so it folds to one char
+        return offset
+
+    def decode(self, start, end):
+        return self.map[start:end].decode('utf-8', errors='replace').replace('\r\n', '\n')
+
+    def window_at(self, offset, size=None):
+        """Return (start, end, text) for the window beginning at byte offset"""
+        start = self.boundary(offset)
+        end = self.boundary(start + (size or self.window))
+        return start, end, self.decode(start, end)
+
+    def segments(self, offset=0):
+        """Yield (char_offset, byte_offset, text) sentences from offset, char offsets counted from offset"""
+        start = self.boundary(offset)
+        chars = 0
+        while start < self.size:
+            end = self.boundary(start + self.window)
+            raw = self.map[start:end].decode('utf-8', errors='replace')
+            text = raw.replace('\r\n', '\n')
+            # Positions in text of the LFs that were CRLF, each one byte longer in the file
+            folds = [match.start() - index for index, match in enumerate(re.finditer('\r\n', raw))]
+            matches = list(SENTENCE_RE.finditer(text))
+            # The last sentence may run into the next window, so re-read it from there
+            if end < self.size and len(matches) > 1:
+                matches.pop()
+            position = byte = 0
+            for match in matches:
+                byte += len(text[position:match.start()].encode('utf-8'))
+                byte += bisect_left(folds, match.start()) - bisect_left(folds, position)
+                yield chars + match.start(), start + byte, match.group()
+                byte += len(match.group().encode('utf-8'))
+                byte += bisect_left(folds, match.end()) - bisect_left(folds, match.start())
+                position = match.end()
+            if end >= self.size:
+                return
+            if not matches:
+                chars += len(text)
+                start = end
+                continue
+            chars += position
+            start += byte
+
+    def close(self):
+        if self.size:
+            self.map.close()
+        self.file.close()
+
+
+class NormalizedText():
+    """Text in canonical form plus the original offset of each of its characters"""
+
+    def __init__(self, text, offsets=None):
+        self.text = text
+        self.offsets = offsets  # None when offsets are unchanged; otherwise len(text) + 1 entries
+
+    def original(self, position):
+        """Offset in the original text of a position in the normalized text"""
+        return int(self.offsets[position]) if self.offsets is not None else position
+
+    def original_span(self, start, end):
+        return self.original(start), self.original(end)
+
+    def originals(self, positions):
+        """Original offsets for a numpy array of positions in the normalized text"""
+        return self.offsets[positions] if self.offsets is not None else positions
+
+    @property
+    def key(self):
+        """Canonical key for reuse: ignores surrounding whitespace and trailing . , ; :"""
+        return self.text.strip().rstrip('.,;:').rstrip()
+
+
+class TextNormalizer():
+    """Folds trivially different inputs to one canonical text for synthesis, reuse and word matching.
+
+    Applies Unicode NFC, folds typographic quotes, dashes and odd spaces to
+    ASCII, turns whitespace runs into one space (or one newline if they break a
+    line, including U+2029 from Qt selections) and drops invisible characters.
+    Every output character keeps the offset of the input character it came
+    from, so highlighting still lands on exact document positions.
+    """
+    FOLD = str.maketrans({
+        '\u2018': "'", '\u2019': "'", '\u201a': "'", '\u201b': "'", '\u2032': "'",
+        '\u201c': '"', '\u201d': '"', '\u201e': '"', '\u201f': '"', '\u2033': '"', '\u00ab': '"', '\u00bb': '"',
+        '\u2010': '-', '\u2011': '-', '\u2012': '-', '\u2013': '-', '\u2014': '-', '\u2015': '-', '\u2212': '-',
+    })
+    # Whitespace needing change (runs, or anything but a lone space/newline), or invisible characters to drop
+    CHANGES_RE = re.compile(r'(\s{2,}|[^\S \n])|[\u200b\u2060\u00ad\ufeff]+')
+    NEWLINES = frozenset('\n\r\x0b\x0c\x85\u2028\u2029')
+
+    marks_re = None
+
+    def normalize(self, text):
+        offsets = None
+        # Compose again after folding: dropping an invisible character can join a mark to its base
+        for step in (self.compose, self.fold, self.compose):
+            text, positions = step(text)
+            if positions is not None:
+                offsets = positions if offsets is None else offsets[positions]
+        return NormalizedText(text, offsets)
+
+    def fold(self, text):
+        """Fold quotes, dashes and whitespace, and drop invisible characters"""
+        def fold_space(match):
+            if not match.group(1):
+                return ''
+            return '\n' if not self.NEWLINES.isdisjoint(match.group()) else ' '
+        text = text.translate(self.FOLD)
+        return self.splice(text, self.CHANGES_RE.finditer(text), fold_space)
+
+    def compose(self, text):
+        """NFC that maps each output character back to the start of the cluster it came from"""
+        if unicodedata.is_normalized('NFC', text):
+            return text, None
+        if self.marks_re is None:
+            marks = ''.join(re.escape(chr(code)) for code in range(sys.maxunicode + 1) if unicodedata.combining(chr(code)))
+            hangul = '(?:[\u1100-\u1112][\u1161-\u1175]|[\uac00-\ud7a3])[\u11a8-\u11c2]?'
+            TextNormalizer.marks_re = re.compile(f'{hangul}[{marks}]*|.[{marks}]+', re.S)
+            TextNormalizer.clusters_re = re.compile(f'{hangul}[{marks}]*|.[{marks}]*', re.S)
+        compose = lambda match: unicodedata.normalize('NFC', match.group())
+        composed, offsets = self.splice(text, self.marks_re.finditer(text), compose)
+        if not unicodedata.is_normalized('NFC', composed):
+            # Compositions without combining marks (Hangul jamo, singletons): take every cluster
+            composed, offsets = self.splice(text, self.clusters_re.finditer(text), compose)
+        return composed, offsets
+
+    def splice(self, text, matches, replace):
+        """Replace each match, returning (text, offsets) where every output character maps to an input offset.
+
+        Offsets is None if nothing matched.
+        """
+        pieces = []
+        starts, ends, lengths = array('q'), array('q'), array('q')
+        last = 0
+        for match in matches:
+            replacement = replace(match)
+            pieces.append(text[last:match.start()])
+            pieces.append(replacement)
+            starts.append(match.start())
+            ends.append(match.end())
+            lengths.append(len(replacement))
+            last = match.end()
+        if not pieces:
+            return text, None
+        pieces.append(text[last:])
+        # Output alternates unchanged runs (step 1) with replacements pinned to their match start (step 0)
+        starts, ends, lengths = (np.frombuffer(column, dtype=np.int64) for column in (starts, ends, lengths))
+        run_starts = np.concatenate(([0], ends))
+        run_lengths = np.append(starts, len(text) + 1) - run_starts
+        source = np.column_stack((run_starts, np.append(starts, 0))).ravel()[:-1]
+        sizes = np.column_stack((run_lengths, np.append(lengths, 0))).ravel()[:-1]
+        steps = np.resize([1, 0], len(sizes))
+        targets = np.cumsum(sizes) - sizes
+        offsets = np.repeat(source - targets * steps, sizes) + np.arange(sizes.sum()) * np.repeat(steps, sizes)
+        return ''.join(pieces), offsets
+
+    def key(self, text):
+        return self.normalize(text).key
+
+
+class WordTimingTable():
+    """Word timings kept as parallel typed columns instead of one Python object per word.
+
+    Columns are char_start/char_end (offsets into the spoken text) and
+    time_start/time_end (seconds from the start of playback). Rows are appended
+    in speaking order, so both char_start and time_start are sorted and can be
+    binary searched. The speech thread appends and bumps `count` last, so the UI
+    thread can read any row below a `count` it has seen without locking.
+    Serialized, it is a header then each column in turn, all little-endian.
+    """
+    HEADER = struct.Struct('<4sQ')
+    MAGIC = b'WTT1'
+    normalizer = TextNormalizer()
+    COLUMNS = (('char_start', 'q'), ('char_end', 'q'), ('time_start', 'd'), ('time_end', 'd'))
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        for name, typecode in self.COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        return self.count
+
+    def append(self, char_start, char_end, time_start, time_end):
+        self.char_start.append(char_start)
+        self.char_end.append(char_end)
+        self.time_start.append(time_start)
+        self.time_end.append(time_end)
+        self.count += 1
+
+    def add_engine_timings(self, text, timings, char_offset=0, time_offset=0.0):
+        """Append engine (start_time, end_time, word) tuples, locating each word in text after the previous one.
+
+        text is normalized (see TextNormalizer); engine words are normalized the
+        same way, so quotes, dashes and Unicode forms the engine changed still match.
+        """
+        lowered = text.lower()
+        # A few characters (e.g. U+0130) change length when lowered, which would shift every later offset
+        ignore_case = len(lowered) == len(text)
+        if not ignore_case:
+            lowered = text
+        # Continue after the last recorded word so repeated words map to successive occurrences
+        search_from = max(0, self.char_end[self.count - 1] - char_offset) if self.count else 0
+        for start_time, end_time, word in timings:
+            word = self.normalizer.normalize(word).text.strip('.,!?;:"\' ')
+            if ignore_case:
+                word = word.lower()
+            pos = lowered.find(word, search_from) if word else -1
+            if pos < 0:
+                # Keep the timing but give it an empty span at the current position
+                pos = end = search_from
+            else:
+                end = search_from = pos + len(word)
+            self.append(char_offset + pos, char_offset + end, time_offset + start_time, time_offset + end_time)
+
+    def extend(self, other, time_offset=0.0, char_offset=0, normalized=None, start=0):
+        """Append another table's rows without going through Python objects per word.
+
+        Char positions are shifted by start, mapped back to the original text
+        if normalized (a NormalizedText) is given, then shifted by char_offset.
+        Times are shifted by time_offset.
+        """
+        if not len(other):
+            return
+        columns = [np.frombuffer(column, dtype=typecode) for column, (name, typecode) in zip(other.columns(), self.COLUMNS)]
+        for (name, typecode), column in zip(self.COLUMNS, columns):
+            if typecode == 'q':
+                column = column + start
+                if normalized is not None:
+                    column = normalized.originals(column)
+                column = column + char_offset
+            else:
+                column = column + time_offset
+            getattr(self, name).frombytes(column.astype(typecode).tobytes())
+        self.count += len(other)
+
+    def span(self, index):
+        return self.char_start[index], self.char_end[index]
+
+    def word_at_time(self, seconds):
+        """Index of the last word started at or before seconds, or -1"""
+        return bisect_right(self.time_start, seconds, 0, self.count) - 1
+
+    def time_at_char(self, offset):
+        """Start time of the word containing or preceding a char offset, or 0.0"""
+        index = bisect_right(self.char_start, offset, 0, self.count) - 1
+        return self.time_start[index] if index >= 0 else 0.0
+
+    def columns(self):
+        """Memoryviews over each column, e.g. for numpy.frombuffer without copying"""
+        return [memoryview(getattr(self, name))[:self.count] for name, typecode in self.COLUMNS]
+
+    def buffers(self):
+        """Header plus little-endian column buffers, ready for file.writelines or socket.sendmsg.
+
+        On little-endian machines the columns are not copied.
+        """
+        columns = self.columns()
+        if sys.byteorder != 'little':
+            columns = [memoryview(self.swapped(column)) for column in columns]
+        return [self.HEADER.pack(self.MAGIC, self.count)] + [column.cast('B') for column in columns]
+
+    @staticmethod
+    def swapped(column):
+        copy = array(column.format, column)
+        copy.byteswap()
+        return copy
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Read-only table over the buffers() format; its columns are views into buffer on little-endian machines"""
+        view = memoryview(buffer)
+        magic, count = cls.HEADER.unpack_from(view)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a word timing table")
+        table = cls.__new__(cls)
+        table.count = count
+        offset = cls.HEADER.size
+        for name, typecode in cls.COLUMNS:
+            size = count * array(typecode).itemsize
+            if offset + size > len(view):
+                raise ValueError("Truncated word timing table")
+            column = view[offset:offset + size].cast(typecode)
+            setattr(table, name, column if sys.byteorder == 'little' else cls.swapped(column))
+            offset += size
+        return table
+
+
+def align_words(audio_bytes, sample_rate, text, table=None, char_offset=0, time_offset=0.0,
+                frame_ms=10, min_pause_ms=120):
+    """Estimate word timings from the PCM itself for engines that report none.
+
+    Short-time energy marks voiced frames; words are spread over voiced time in
+    proportion to their length, then the word boundary nearest each detected
+    pause is moved onto that pause. Appends to table and returns it.
+    """
+    table = table if table is not None else WordTimingTable()
+    words = list(WORD_RE.finditer(text))
+    samples = np.frombuffer(audio_bytes, dtype=np.int16)
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(samples) // frame
+    if not words or n_frames == 0:
+        return table
+
+    frames = samples[:n_frames * frame].astype(np.float32).reshape(n_frames, frame)
+    level = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-3)
+    threshold = max(np.percentile(level, 10) + 6, np.percentile(level, 95) - 30)
+    voiced = level > threshold
+
+    # Silence runs, treating the edges as voiced so leading/trailing silence counts as a run
+    change = np.diff(np.concatenate(([1], voiced.astype(np.int8), [1])))
+    run_start = np.flatnonzero(change == -1)
+    run_end = np.flatnonzero(change == 1)
+    internal = (run_start > 0) & (run_end < n_frames)
+    is_pause = (run_end - run_start) >= max(1, min_pause_ms // frame_ms)
+    # Gaps too short to be pauses are stop consonants and the like: fill them in
+    fill = np.zeros(n_frames + 1, dtype=np.int32)
+    np.add.at(fill, run_start[internal & ~is_pause], 1)
+    np.add.at(fill, run_end[internal & ~is_pause], -1)
+    voiced |= np.cumsum(fill[:-1]) > 0
+    if not voiced.any():
+        voiced[:] = True
+
+    # Map cumulative character weight onto cumulative voiced frames
+    weights = np.array([m.end() - m.start() for m in words], dtype=np.float64)
+    bounds = np.concatenate(([0.0], np.cumsum(weights))) / weights.sum()
+    voiced_total = np.cumsum(voiced)
+    positions = bounds * voiced_total[-1]
+    starts = np.searchsorted(voiced_total, positions[:-1], side='right').astype(np.float64)
+    ends = np.searchsorted(voiced_total, positions[1:], side='left').astype(np.float64) + 1
+
+    # Snap the nearest word boundary onto each pause between words
+    pauses = internal & is_pause
+    if len(words) > 1 and pauses.any():
+        gaps = (ends[:-1] + starts[1:]) / 2
+        centres = (run_start[pauses] + run_end[pauses]) / 2
+        right = np.searchsorted(gaps, centres).clip(0, len(gaps) - 1)
+        left = (right - 1).clip(0)
+        nearest = np.where(np.abs(gaps[left] - centres) <= np.abs(gaps[right] - centres), left, right)
+        ends[nearest] = run_start[pauses]
+        starts[nearest + 1] = run_end[pauses]
+        ends = np.maximum(ends, starts)
+
+    seconds = frame / sample_rate
+    for match, start, end in zip(words, starts * seconds, ends * seconds):
+        table.append(char_offset + match.start(), char_offset + match.end(),
+                     time_offset + float(start), time_offset + float(end))
+    return table
+
+
+class IncrementalSynthesizer():
+    """Re-synthesizes only the sentences that changed since the last reading.
+
+    The last reading is kept as sentence keys with their audio and word
+    timings, up to max_bytes of audio; difflib matches it against the new text
+    sentence by sentence, so a small edit costs one sentence of synthesis
+    rather than the whole document, even with the audio cache turned off.
+    Sentences that are not kept are looked up in the audio cache as usual.
+    """
+
+    def __init__(self, voiceManager, max_bytes=32 * 1024 * 1024):
+        self.voiceManager = voiceManager
+        self.max_bytes = max_bytes
+        self.key = None
+        self.sentences = []
+        self.segments = []
+
+    def stream(self, normalized, table):
+        """Yield (audio_bytes, sample_rate) per sentence of a NormalizedText, appending word timings to table first.
+
+        Timings are recorded at offsets in the original text.
+        """
+        key = self.voiceManager.voice_key()
+        if key != self.key:
+            self.key, self.sentences, self.segments = key, [], []
+
+        text = normalized.text
+        spans = [(match.start(), match.end()) for match in SENTENCE_RE.finditer(text)]
+        sentences = [text[start:end] for start, end in spans]
+        segments = [None] * len(sentences)
+        keys = [NormalizedText(sentence).key for sentence in sentences]
+        matcher = difflib.SequenceMatcher(None, self.sentences, keys, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                segments[j1:j2] = self.segments[i1:i2]
+        missing = [index for index, segment in enumerate(segments) if segment is None]
+        logging.debug(f"Reusing {len(sentences) - len(missing)} of {len(sentences)} sentences from the last reading")
+        rendered = self.voiceManager.synthesize_many(sentences[index] for index in missing)
+        # Filled in place, so an interrupted reading still keeps what was rendered
+        self.sentences, self.segments = keys, segments
+        kept = sum(len(segment[0]) for segment in segments if segment)
+
+        offset = 0.0
+        for index, (start, end) in enumerate(spans):
+            segment = segments[index]
+            if segment is None:
+                segment = next(rendered)
+                if kept + len(segment[0]) <= self.max_bytes:
+                    segments[index] = segment
+                    kept += len(segment[0])
+            audio_bytes, sample_rate, sentence_table = segment
+            table.extend(sentence_table, offset, normalized=normalized, start=start)
+            offset += len(audio_bytes) / 2 / sample_rate
+            yield audio_bytes, sample_rate
+
+
+class PcmCodec():
+    """Uncompressed 16-bit PCM"""
+    name = 'pcm'
+
+    def encode(self, audio_bytes, sample_rate):
+        return audio_bytes
+
+    def decode(self, payload, sample_rate, block_size=65536):
+        for first in range(0, len(payload), block_size * 2):
+            yield bytes(payload[first:first + block_size * 2])
+
+
+class DeltaZlibCodec():
+    """Lossless: first differences of the samples, deflated. Speech deltas are small, so they compress well"""
+    name = 'zlib'
+
+    def encode(self, audio_bytes, sample_rate):
+        samples = np.frombuffer(audio_bytes, dtype=np.int16)
+        # int16 arithmetic wraps, and the cumulative sum on decode wraps back exactly
+        deltas = np.diff(samples, prepend=np.int16(0))
+        return zlib.compress(deltas.tobytes(), 6)
+
+    def decode(self, payload, sample_rate, block_size=65536):
+        decompressor = zlib.decompressobj()
+        carry = np.int16(0)
+        pending = b''
+        data = bytes(payload)
+        while not decompressor.eof:
+            chunk = decompressor.decompress(data, block_size * 2)
+            data = decompressor.unconsumed_tail
+            if not chunk and not data and not decompressor.eof:
+                raise ValueError("Truncated zlib audio")
+            pending += chunk
+            usable = len(pending) // 2 * 2
+            if not usable:
+                continue
+            samples = np.cumsum(np.frombuffer(pending[:usable], dtype=np.int16), dtype=np.int16) + carry
+            carry = samples[-1]
+            pending = pending[usable:]
+            yield samples.astype(np.int16).tobytes()
+
+
+class FlacCodec():
+    """Lossless FLAC through soundfile"""
+    name = 'flac'
+
+    def encode(self, audio_bytes, sample_rate):
+        output = io.BytesIO()
+        soundfile.write(output, np.frombuffer(audio_bytes, dtype=np.int16), sample_rate, format='FLAC', subtype='PCM_16')
+        return output.getvalue()
+
+    def decode(self, payload, sample_rate, block_size=65536):
+        with soundfile.SoundFile(io.BytesIO(payload)) as flac:
+            while True:
+                block = flac.read(block_size, dtype='int16')
+                if not len(block):
+                    return
+                yield block.tobytes()
+
+
+class AdpcmCodec():
+    """Lossy IMA ADPCM at 4 bits per sample: a quarter of the size for almost no CPU"""
+    name = 'adpcm'
+
+    def encode(self, audio_bytes, sample_rate):
+        return audioop.lin2adpcm(audio_bytes, 2, None)[0]
+
+    def decode(self, payload, sample_rate, block_size=65536):
+        state = None
+        for first in range(0, len(payload), block_size // 2):
+            block, state = audioop.adpcm2lin(bytes(payload[first:first + block_size // 2]), 2, state)
+            yield block
+
+
+AUDIO_CODECS = {codec.name: codec for codec, available in (
+    (PcmCodec(), True),
+    (DeltaZlibCodec(), True),
+    (FlacCodec(), soundfile is not None),
+    (AdpcmCodec(), audioop is not None),
+) if available}
+
+
+class AudioCache():
+    """Disk cache of synthesized sentences and their word timings, stored with a pluggable codec.
+
+    Entries are keyed by engine, voice, rate and text. Encoding and writing
+    happen on a background thread so the speech thread never waits on them.
+    Past max_bytes the least recently used entries are evicted down to 80% of
+    it; reading an entry marks it used by touching its modification time.
+    """
+    HEADER = struct.Struct('<4s8sIQ')
+    MAGIC = b'PRA1'
+
+    def __init__(self, folder='cache', codec='flac', max_bytes=256 * 1024 * 1024):
+        self.folder = folder
+        if codec not in AUDIO_CODECS:
+            logging.warning(f"Audio cache codec {codec} is not available, using zlib")
+            codec = 'zlib'
+        self.codec = AUDIO_CODECS[codec]
+        self.max_bytes = max_bytes
+        self.size = None  # Bytes on disk, counted by the writer thread when it first needs it
+        self.writes = queue.Queue(maxsize=64)
+        self.writer = threading.Thread(target=self.write_entries, daemon=True)
+        self.writer.start()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """The cache configured in settings.json, or None if it is turned off"""
+        codec = settings.get('audio_cache_codec', 'flac')
+        if codec == 'off':
+            return None
+        return cls(settings.get('audio_cache_folder', 'cache'), codec, settings.get('audio_cache_max_mb', 256) * 1024 * 1024)
+
+    def path(self, voice_key, text):
+        digest = hashlib.sha1(json.dumps([list(voice_key), text]).encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, digest[:2], digest + '.pra')
+
+    def get(self, voice_key, text):
+        """Return (audio_bytes, sample_rate, timings) for a cached sentence, or None.
+
+        The codecs decode block by block, but the sentence is joined here: the
+        player levels it by its overall loudness and timings need its length.
+        """
+        path = self.path(voice_key, text)
+        try:
+            with open(path, 'rb') as file:
+                data = memoryview(file.read())
+            magic, codec, sample_rate, timings_size = self.HEADER.unpack_from(data)
+            if magic != self.MAGIC:
+                raise ValueError("Not an audio cache entry")
+            timings = WordTimingTable.from_buffer(data[self.HEADER.size:self.HEADER.size + timings_size])
+            payload = data[self.HEADER.size + timings_size:]
+            # Silent sentences (a bare "..." or "!?") are stored with no payload at all
+            audio_bytes = b''.join(AUDIO_CODECS[codec.rstrip(b'\0').decode('ascii')].decode(payload, sample_rate)) if payload else b''
+            with contextlib.suppress(OSError):
+                os.utime(path)
+            return audio_bytes, sample_rate, timings
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Discarding unreadable audio cache entry {path}: {e}")
+            return None
+
+    def put(self, voice_key, text, audio_bytes, sample_rate, timings):
+        """Queue a sentence to be encoded and stored; dropped if the writer is backed up"""
+        try:
+            self.writes.put_nowait((self.path(voice_key, text), audio_bytes, sample_rate, b''.join(timings.buffers())))
+        except queue.Full:
+            logging.debug("Audio cache writer busy, not caching sentence")
+
+    def write_entries(self):
+        while True:
+            path, audio_bytes, sample_rate, timings = self.writes.get()
+            try:
+                payload = self.codec.encode(audio_bytes, sample_rate) if audio_bytes else b''
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temporary = path + '.tmp'
+                with open(temporary, 'wb') as file:
+                    file.write(self.HEADER.pack(self.MAGIC, self.codec.name.encode('ascii'), sample_rate, len(timings)))
+                    file.write(timings)
+                    file.write(payload)
+                if self.size is None:
+                    self.size = sum(size for mtime, size, entry in self.entries())
+                if os.path.exists(path):
+                    self.size -= os.path.getsize(path)
+                self.size += os.path.getsize(temporary)
+                os.replace(temporary, path)
+                if self.max_bytes and self.size > self.max_bytes:
+                    self.evict(self.max_bytes * 4 // 5)
+            except Exception as e:
+                logging.error(f"Error writing audio cache entry: {e}")
+            finally:
+                self.writes.task_done()
+
+    def entries(self):
+        """Yield (mtime, size, path) for every entry on disk"""
+        if not os.path.isdir(self.folder):
+            return
+        for bucket in os.scandir(self.folder):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith('.pra'):
+                    stat = entry.stat()
+                    yield stat.st_mtime, stat.st_size, entry.path
+
+    def evict(self, target):
+        """Delete least recently used entries until the cache is at most target bytes"""
+        removed = 0
+        for mtime, size, path in sorted(self.entries()):
+            if self.size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
+            removed += 1
+        logging.debug(f"Evicted {removed} audio cache entries, {self.size} bytes left")
+
+
+class AudioConditioner():
+    """Brings PCM from any engine to one output rate and a consistent loudness.
+
+    Audio is resampled in fixed-size blocks (with a windowed-sinc low-pass when
+    downsampling) and levelled towards target_db, with the gain ramped from the
+    previous chunk's so joins neither jump in level nor dip. Chunks are joined
+    back to back; only the start and end of a stream are faded over a few
+    milliseconds, which is why the last fade_ms are held back until flush().
+    Nothing changes the length, so word timings stay valid.
+    """
+
+    def __init__(self, output_rate=24000, target_db=-20.0, fade_ms=5, ramp_ms=50, block_size=8192):
+        self.output_rate = output_rate
+        self.target_db = target_db
+        self.fade = max(1, output_rate * fade_ms // 1000)
+        self.ramp = max(1, output_rate * ramp_ms // 1000)
+        self.block_size = block_size
+        self.filters = {}
+        self.reset()
+
+    def reset(self):
+        self.gain = None
+        self.tail = np.zeros(0, dtype=np.int16)  # Held back so the stream's end can be faded out
+
+    def lowpass(self, step):
+        """Anti-aliasing filter for reading every step-th input sample"""
+        if step not in self.filters:
+            cutoff = 0.45 / step
+            n = np.arange(-16 * int(np.ceil(step)), 16 * int(np.ceil(step)) + 1)
+            taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(len(n))
+            self.filters[step] = (taps / taps.sum()).astype(np.float32)
+        return self.filters[step]
+
+    def level(self, samples):
+        """RMS level in dBFS over 20 ms frames louder than -50 dBFS"""
+        frame = max(1, self.output_rate // 50)
+        gate = (32768 * 10 ** (-50 / 20)) ** 2
+        total = count = 0
+        for first in range(0, len(samples) - frame + 1, self.block_size * 4):
+            block = samples[first:first + self.block_size * 4].astype(np.float32)
+            block = block[:len(block) // frame * frame].reshape(-1, frame)
+            energy = np.mean(block * block, axis=1)
+            loud = energy > gate
+            total += energy[loud].sum()
+            count += loud.sum()
+        if not count:
+            return None
+        return 10 * np.log10(total / count / 32768 ** 2)
+
+    def resample(self, samples, sample_rate):
+        """Yield (float32 block, total output length) pairs of samples resampled to output_rate"""
+        step = sample_rate / self.output_rate
+        out_len = int(len(samples) / step)
+        taps = self.lowpass(step) if step > 1 else None
+        margin = len(taps) // 2 if taps is not None else 0
+        for first in range(0, out_len, self.block_size):
+            positions = np.arange(first, min(first + self.block_size, out_len)) * step
+            lo = int(positions[0]) - margin
+            hi = int(positions[-1]) + 2 + margin
+            block = np.zeros(hi - lo, dtype=np.float32)
+            block[max(0, -lo):max(0, -lo) + len(samples[max(lo, 0):hi])] = samples[max(lo, 0):hi]
+            if taps is not None:
+                block = np.convolve(block, taps, mode='same')
+            yield np.interp(positions - lo, np.arange(len(block)), block).astype(np.float32), out_len
+
+    def process(self, audio_bytes, sample_rate):
+        """Yield conditioned 16-bit PCM blocks at output_rate for one chunk of audio"""
+        samples = np.frombuffer(audio_bytes, dtype=np.int16)
+        if not len(samples):
+            return
+        level = self.level(samples)
+        gain = 1.0 if level is None else float(np.clip(10 ** ((self.target_db - level) / 20), 0.1, 10.0))
+        stream_start = self.gain is None
+        previous = gain if stream_start else self.gain
+        self.gain = gain
+        first = 0
+        for block, out_len in self.resample(samples, sample_rate):
+            index = np.arange(first, first + len(block), dtype=np.float32)
+            envelope = previous + (gain - previous) * np.minimum(index / self.ramp, 1.0)
+            if stream_start:
+                envelope *= np.minimum(index / self.fade, 1.0)
+            first += len(block)
+            output = np.concatenate((self.tail, np.clip(block * envelope, -32768, 32767).astype(np.int16)))
+            self.tail = output[-self.fade:]
+            if len(output) > self.fade:
+                yield output[:-self.fade].tobytes()
+
+    def flush(self):
+        """Yield the held-back end of the stream, faded out"""
+        if len(self.tail):
+            envelope = np.arange(len(self.tail), 0, -1, dtype=np.float32) / self.fade
+            yield (self.tail * np.minimum(envelope, 1.0)).astype(np.int16).tobytes()
+        self.tail = np.zeros(0, dtype=np.int16)
+
+
+class AudioPlayer():
+    """Plays PCM through one PyAudio stream kept open for the whole session.
+
+    Everything written goes through an AudioConditioner first, so engines with
+    different rates and levels never reopen the device. Audio can be written
+    while it plays; write() blocks while max_queued_seconds are waiting, so
+    producers stay just ahead of playback. Underruns play silence without
+    advancing the clock used for highlighting.
+    """
+
+    def __init__(self, conditioner=None, max_queued_seconds=2.0):
+        self.conditioner = conditioner or AudioConditioner()
+        self.audio = None
+        self.stream = None
+        self.chunks = collections.deque()
+        self.chunk_offset = 0
+        self.queued = 0  # Bytes written but not yet played
+        self.max_queued = int(self.conditioner.output_rate * 2 * max_queued_seconds)
+        self.lock = threading.Lock()
+        self.space = threading.Condition(self.lock)
+        self.stopped = False
+        self.frames_played = 0
+        self.finishing = False
+        self.done = threading.Event()
+        self.done.set()
+
+    def callback(self, in_data, frame_count, time_info, status):
+        wanted = frame_count * 2
+        data = bytearray()
+        with self.lock:
+            while self.chunks and len(data) < wanted:
+                chunk = self.chunks[0]
+                piece = chunk[self.chunk_offset:self.chunk_offset + wanted - len(data)]
+                data += piece
+                self.chunk_offset += len(piece)
+                if self.chunk_offset >= len(chunk):
+                    self.chunks.popleft()
+                    self.chunk_offset = 0
+            self.queued -= len(data)
+            self.space.notify_all()
+            if self.finishing and not self.chunks:
+                self.done.set()
+        self.frames_played += len(data) // 2
+        if len(data) < wanted:
+            data += b'\x00' * (wanted - len(data))
+        return bytes(data), pyaudio.paContinue
+
+    def open(self):
+        if self.audio is None:
+            self.audio = pyaudio.PyAudio()
+        if self.stream is None:
+            self.stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=self.conditioner.output_rate,
+                                          output=True, stream_callback=self.callback)
+
+    def start(self):
+        """Begin a reading; audio is then fed with write() and ended with finish()"""
+        self.open()
+        with self.lock:
+            self.chunks.clear()
+            self.chunk_offset = 0
+            self.queued = 0
+            self.stopped = False
+            self.finishing = False
+            self.frames_played = 0
+        self.conditioner.reset()
+        self.done.clear()
+
+    def write(self, audio_bytes, sample_rate):
+        """Queue audio, waiting for room; returns False if the reading was stopped"""
+        return self.queue(self.conditioner.process(audio_bytes, sample_rate))
+
+    def queue(self, blocks):
+        for block in blocks:
+            with self.space:
+                self.space.wait_for(lambda: self.queued < self.max_queued or self.stopped)
+                if self.stopped:
+                    return False
+                self.chunks.append(block)
+                self.queued += len(block)
+        return True
+
+    def finish(self):
+        """Mark the reading complete once everything written has played"""
+        self.queue(self.conditioner.flush())
+        with self.lock:
+            self.finishing = True
+
+    def wait(self):
+        """Block until the reading drains or stop() is called"""
+        self.done.wait()
+
+    def play(self, audio_bytes, sample_rate):
+        """Play audio, blocking until it finishes or stop() is called"""
+        self.start()
+        self.write(audio_bytes, sample_rate)
+        self.finish()
+        self.wait()
+
+    def stop(self):
+        with self.lock:
+            self.chunks.clear()
+            self.chunk_offset = 0
+            self.queued = 0
+            self.stopped = True
+            self.space.notify_all()
+        self.done.set()
+
+    def position(self):
+        """Seconds of the current reading that have actually reached the speakers"""
+        stream = self.stream
+        latency = stream.get_output_latency() if stream else 0.0
+        return max(0.0, self.frames_played / self.conditioner.output_rate - latency)
+
+    def close(self):
+        self.stop()
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        if self.audio is not None:
+            self.audio.terminate()
+            self.audio = None
+
+
+def read_speech_file(path):
+    """Return (audio_bytes, sample_rate) as 16-bit mono PCM from a file saved by a pyttsx3 driver.
+
+    Most drivers write WAV, but macOS (nsss) writes AIFF whatever the name,
+    so the format is detected from the file itself.
+    """
+    if soundfile is not None:
+        samples, sample_rate = soundfile.read(path, dtype='int16', always_2d=True)
+        if samples.shape[1] > 1:
+            samples = samples.mean(axis=1).astype(np.int16)
+        return np.ascontiguousarray(samples).tobytes(), sample_rate
+    with open(path, 'rb') as file:
+        magic = file.read(4)
+    if magic != b'RIFF':
+        raise ValueError(f"Reading {magic!r} audio files (AIFF on macOS) needs the soundfile package")
+    with wave.open(path, 'rb') as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"Unsupported sample width {wav.getsampwidth()}")
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        audio_bytes = wav.readframes(wav.getnframes())
+    if channels > 1:
+        samples = np.frombuffer(audio_bytes, dtype=np.int16).reshape(-1, channels)
+        audio_bytes = samples.mean(axis=1).astype(np.int16).tobytes()
+    return audio_bytes, sample_rate
+
+def system_voice_worker(slot, tasks, results, voice_id, rate):
+    """Worker process: render each (job_id, text) task to PCM with its own pyttsx3 engine"""
+    engine = pyttsx3.init()
+    if voice_id:
+        engine.setProperty('voice', voice_id)
+    engine.setProperty('rate', rate)
+    with tempfile.TemporaryDirectory() as folder:
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            job_id, text = task
+            path = os.path.join(folder, f"{job_id}.wav")
+            try:
+                engine.save_to_file(text, path)
+                engine.runAndWait()
+                audio_bytes, sample_rate = read_speech_file(path)
+                results.put((slot, job_id, audio_bytes, sample_rate, None))
+            except Exception as e:
+                results.put((slot, job_id, None, 0, str(e)))
+            finally:
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class SystemVoicePool():
+    """Renders system (pyttsx3) speech to PCM in isolated worker processes.
+
+    Each worker owns its own engine, so offline rendering runs in parallel and a
+    crashed or hung driver only costs one worker: the watchdog kills it, starts a
+    replacement and retries the text once before failing it.
+    """
+
+    def __init__(self, voice_id=None, rate=200, workers=None, timeout=30):
+        self.voice = (voice_id, rate)
+        self.size = workers or max(1, min(4, os.cpu_count() or 1))
+        self.timeout = timeout
+        self.context = multiprocessing.get_context('spawn')
+        self.results = self.context.Queue()
+        self.workers = {}  # slot -> (process, task queue)
+        self.busy = {}  # slot -> (job_id, text, future, attempts, deadline)
+        self.pending = collections.deque()  # (job_id, text, future, attempts)
+        self.lock = threading.Lock()
+        self.next_job = 0
+        self.running = True
+        for slot in range(self.size):
+            self.start_worker(slot)
+        self.watchdog = threading.Thread(target=self.supervise, daemon=True)
+        self.watchdog.start()
+
+    def start_worker(self, slot):
+        """Spawn a worker for slot; called without holding the lock, since spawning is slow"""
+        tasks = self.context.Queue()
+        process = self.context.Process(target=system_voice_worker, daemon=True,
+                                       args=(slot, tasks, self.results) + self.voice)
+        process.start()
+        with self.lock:
+            self.workers[slot] = (process, tasks)
+        logging.debug(f"Started system voice worker {slot} (pid {process.pid})")
+
+    def render(self, text):
+        """Queue text for rendering; the Future resolves to (audio_bytes, sample_rate, [])"""
+        future = Future()
+        with self.lock:
+            self.next_job += 1
+            self.pending.append((self.next_job, text, future, 0))
+        return future
+
+    def dispatch(self):
+        with self.lock:
+            for slot in self.workers:
+                if slot in self.busy or not self.pending:
+                    continue
+                job_id, text, future, attempts = self.pending.popleft()
+                if attempts == 0 and not future.set_running_or_notify_cancel():
+                    continue
+                self.busy[slot] = (job_id, text, future, attempts, time.monotonic() + self.timeout)
+                self.workers[slot][1].put((job_id, text))
+
+    def retire(self, slot, reason):
+        """Take a failed worker out of the pool and retry or fail its job; call with the lock held"""
+        process, tasks = self.workers.pop(slot)
+        if slot not in self.busy:
+            return process
+        logging.error(f"System voice worker {slot} (pid {process.pid}) {reason}; restarting")
+        job_id, text, future, attempts, deadline = self.busy.pop(slot)
+        if attempts < 1:
+            self.pending.appendleft((job_id, text, future, attempts + 1))
+        else:
+            future.set_exception(RuntimeError(f"System voice worker {reason}"))
+        return process
+
+    def supervise(self):
+        while self.running:
+            self.dispatch()
+            try:
+                slot, job_id, audio_bytes, sample_rate, error = self.results.get(timeout=0.05)
+            except queue.Empty:
+                pass
+            else:
+                with self.lock:
+                    job = self.busy.get(slot)
+                    # Ignore late results from a worker that was already replaced
+                    if job and job[0] == job_id:
+                        del self.busy[slot]
+                        if error:
+                            job[2].set_exception(RuntimeError(error))
+                        else:
+                            job[2].set_result((audio_bytes, sample_rate, []))
+            now = time.monotonic()
+            retired = []
+            with self.lock:
+                for slot, (process, tasks) in list(self.workers.items()):
+                    if not process.is_alive():
+                        retired.append((slot, self.retire(slot, f"exited with code {process.exitcode}")))
+                    elif slot in self.busy and now > self.busy[slot][4]:
+                        retired.append((slot, self.retire(slot, f"hung for more than {self.timeout}s")))
+            # Killing and spawning happen outside the lock so render() never waits on them
+            for slot, process in retired:
+                process.kill()
+                process.join(1)
+                self.start_worker(slot)
+
+    def shutdown(self):
+        self.running = False
+        self.watchdog.join(1)
+        for process, tasks in self.workers.values():
+            tasks.put(None)
+        for process, tasks in self.workers.values():
+            process.join(1)
+            if process.is_alive():
+                process.kill()
+        with self.lock:
+            for job in list(self.busy.values()) + list(self.pending):
+                future = job[2]
+                if not future.cancel() and not future.done():
+                    future.set_exception(RuntimeError("System voice pool shut down"))
+            self.busy.clear()
+            self.pending.clear()
+
+
 class VoiceManager(QObject):
-    wordSpoken = pyqtSignal(int, int)  # Emit the start and end indices of the spoken word
     speakCompleted = pyqtSignal(str) 
     speechStarted = pyqtSignal()
     
-    def __init__(self, configManager):
+    def __init__(self, configManager, cache=None):
         super(VoiceManager, self).__init__()
         self.configManager = configManager
         self.engine_client = self.engine_tts = None
         self.engine_type = 'system'  # Default engine type
         self.ttsx_engine = None
         self.current_text = ""
+        self.normalizer = TextNormalizer()
+        self.timings = WordTimingTable()
+        self.segment_chars, self.segment_bytes = array('q'), array('q')
+        self.profiling = None  # ProfilingSession for the current reading, if any
+        self.player = AudioPlayer()
+        self.incremental = IncrementalSynthesizer(self)
+        self.system_pool = None
+        self.cache = cache or AudioCache.from_settings(configManager.settings)
         self.initialize_system_engine()
 
-    def word_boundary_handler(self, word, start_pos, end_pos):
-        """Handle word timing events from TTS engines"""
-        logging.debug(f"Word boundary event: word='{word}', start={start_pos}, end={end_pos}")
-        try:
-            if self.wordSpoken:
-                # Convert positions to integers if they're not already
-                start = int(float(start_pos) * 1000) if isinstance(start_pos, (str, float)) else start_pos
-                end = int(float(end_pos) * 1000) if isinstance(end_pos, (str, float)) else end_pos
-                
-                # Ensure positions are within text bounds
-                text_length = len(self.current_text)
-                start = max(0, min(start, text_length))
-                end = max(0, min(end, text_length))
-                
-                logging.info(f"Highlighting text from {start} to {end}")
-                self.wordSpoken.emit(start, end)
-        except Exception as e:
-            logging.error(f"Error in word boundary handler: {e}", exc_info=True)
-
-    def word_callback(self, start_char, end_char, word):
-        """Handle word timing events from TTS engines"""
-        logging.info(f"Word callback: {word} ({start_char:.3f}s - {end_char:.3f}s)")
-        try:
-            # Find the word position in the current text
-            text = self.current_text.lower()
-            word = word.lower().strip('.,!?')
-            
-            logging.debug(f"Looking for word '{word}' in text: '{text}'")
-            pos = text.find(word)
-            
-            if pos >= 0:
-                logging.info(f"Found word '{word}' at position {pos}")
-                self.wordSpoken.emit(pos, pos + len(word))
-            else:
-                logging.error(f"Could not find word '{word}' in text")
-                
-        except Exception as e:
-            logging.error(f"Error in word callback: {e}")
-
     def on_speech_start(self):
         """Handle speech start event"""
         logging.debug("Speech started")
@@ -97,8 +1130,6 @@ class VoiceManager(QObject):
         """Connect to TTS engine events"""
         if self.engine_tts:
             try:
-                # Connect word timing callback
-                self.engine_tts.connect('onWord', self.word_callback)
                 # Connect start/end events
                 self.engine_tts.connect('onStart', self.on_speech_start)
                 self.engine_tts.connect('onEnd', self.on_speech_end)
@@ -107,6 +1138,7 @@ class VoiceManager(QObject):
                 logging.error(f"Error connecting to TTS events: {e}")
 
     def speak_threaded(self, text):
+        """Synthesize and play text, recording word timings for the UI to poll against playback_position"""
         logging.info("Starting threaded speech")
         try:
             if not self.engine_tts:
@@ -118,25 +1150,147 @@ class VoiceManager(QObject):
                 return
 
             logging.debug(f"Speaking with engine: {self.engine_type}")
-            
-            def word_callback(start_char, end_char, word):
-                logging.debug(f"Word callback received: word={word}, start={start_char}, end={end_char}")
-                info = {
-                    'word': word,
-                    'start_pos': start_char,
-                    'end_pos': end_char
-                }
-                if self.wordSpoken:
-                    self.wordSpoken.emit(info['start_pos'], info['end_pos'])
-
-            ssml_text = self.engine_tts.ssml.add(text)
-            logging.debug(f"Starting playback with SSML: {ssml_text}")
-            self.engine_tts.start_playback_with_callbacks(ssml_text, callback=word_callback)
+            self.current_text = text
+            self.timings.clear()
+
+            self.play_chunks(self.incremental.stream(self.normalizer.normalize(text), self.timings))
             logging.info("Speech completed successfully")
         except Exception as e:
             logging.error(f"Error in speak_threaded: {e}", exc_info=True)
             raise
 
+    def speak_document(self, document, offset=0):
+        """Read a DocumentSource from a byte offset, synthesizing only a few sentences ahead of playback"""
+        logging.info(f"Starting document speech from byte {offset} of {document.path}")
+        self.current_text = ""
+        self.timings.clear()
+        self.segment_chars, self.segment_bytes = array('q'), array('q')
+        pending = collections.deque()
+
+        def texts():
+            for char_offset, byte_offset, text in document.segments(offset):
+                normalized = self.normalizer.normalize(text)
+                pending.append((char_offset, byte_offset, normalized))
+                yield normalized.text
+
+        def chunks():
+            elapsed = 0.0
+            for audio_bytes, sample_rate, segment in self.synthesize_many(texts()):
+                char_offset, byte_offset, normalized = pending.popleft()
+                self.segment_chars.append(char_offset)
+                self.segment_bytes.append(byte_offset)
+                self.timings.extend(segment, elapsed, char_offset, normalized)
+                elapsed += len(audio_bytes) / 2 / sample_rate
+                yield audio_bytes, sample_rate
+
+        self.play_chunks(chunks())
+
+    def segment_at_char(self, char_offset):
+        """(char_offset, byte_offset) of the document segment containing char_offset"""
+        index = max(0, bisect_right(self.segment_chars, char_offset) - 1)
+        return self.segment_chars[index], self.segment_bytes[index]
+
+    def play_chunks(self, chunks):
+        """Play (audio_bytes, sample_rate) chunks as they arrive; their timings must be recorded first"""
+        started = False
+        try:
+            for audio_bytes, sample_rate in chunks:
+                if self.profiling:
+                    self.profiling.mark('chunk_synthesized')
+                if not started:
+                    self.player.start()
+                    self.on_speech_start()
+                    started = True
+                if not self.player.write(audio_bytes, sample_rate):
+                    break
+        finally:
+            if started:
+                self.player.finish()
+                self.player.wait()
+                self.on_speech_end()
+
+    def synthesize_many(self, texts):
+        """Yield (audio_bytes, sample_rate, WordTimingTable) for texts in order, from the audio cache where possible.
+
+        System voice texts are rendered in parallel a few ahead of the consumer.
+        Texts the engine gave no timings for are aligned from their audio, and
+        fresh results are handed to the cache.
+        """
+        key = self.voice_key()
+        pool = None
+        if self.engine_type == 'system' or self.engine_type == 'System Voice (SAPI)':
+            pool = self.get_system_pool()
+        lookahead = pool.size * 2 if pool else 0
+        in_flight = collections.deque()
+        try:
+            for text in texts:
+                cached = self.cache.get(key, self.normalizer.key(text)) if self.cache else None
+                if cached:
+                    in_flight.append((text, cached, False))
+                else:
+                    in_flight.append((text, pool.render(text) if pool else None, True))
+                while len(in_flight) > lookahead:
+                    yield self.complete_synthesis(key, *in_flight.popleft())
+            while in_flight:
+                yield self.complete_synthesis(key, *in_flight.popleft())
+        finally:
+            for text, result, fresh in in_flight:
+                if isinstance(result, Future):
+                    result.cancel()
+
+    def complete_synthesis(self, key, text, result, fresh):
+        if isinstance(result, Future):
+            result = result.result()
+        elif result is None:
+            result = self.synthesize(text)
+        audio_bytes, sample_rate, timings = result
+        if isinstance(timings, WordTimingTable):
+            table = timings
+        else:
+            table = WordTimingTable()
+            table.add_engine_timings(text, timings)
+            if not timings:
+                align_words(audio_bytes, sample_rate, text, table)
+        if fresh and self.cache:
+            self.cache.put(key, self.normalizer.key(text), audio_bytes, sample_rate, table)
+        return audio_bytes, sample_rate, table
+
+    def voice_key(self):
+        """Identifies the engine, voice and rate that synthesized audio depends on"""
+        settings = self.configManager.settings
+        voice_details = settings.get('voice_details') or {}
+        return (self.engine_type, voice_details.get('id'), settings.get('speech_rate'))
+
+    def get_system_pool(self):
+        """Worker pool for the system voice, restarted when the voice or rate changes"""
+        voice_id = (self.configManager.settings.get('voice_details') or {}).get('id')
+        rate = self.configManager.settings.get('speech_rate', 200)
+        if self.system_pool is None or self.system_pool.voice != (voice_id, rate):
+            if self.system_pool:
+                self.system_pool.shutdown()
+            self.system_pool = SystemVoicePool(voice_id, rate)
+        return self.system_pool
+
+    def playback_position(self):
+        """Seconds of the current reading that have been heard so far"""
+        return self.player.position()
+
+    def synthesize(self, text):
+        """Synthesize text to raw 16-bit mono PCM without playing it.
+
+        Returns (audio_bytes, sample_rate, timings) where timings is the engine's
+        list of (start_time, end_time, word) tuples.
+        """
+        if self.engine_type == 'system' or self.engine_type == 'System Voice (SAPI)':
+            return self.get_system_pool().render(text).result()
+        if not self.engine_tts:
+            raise RuntimeError(f"Engine {self.engine_type} cannot synthesize to memory")
+        ssml_text = self.engine_tts.ssml.add(text)
+        audio_bytes = self.engine_tts.synth_to_bytes(ssml_text)
+        if audio_bytes[:4] == b"RIFF":
+            audio_bytes = self.engine_tts._strip_wav_header(audio_bytes)
+        return audio_bytes, self.engine_tts.audio_rate, list(self.engine_tts.get_timings())
+
     def init_tts_wrapper(self, engine_type):
         """Initialize the selected TTS engine"""
         print(f"{engine_type} being set")
@@ -262,6 +1416,9 @@ class VoiceManager(QObject):
                 logging.debug(f"Error synthesizing or playing audio: {e}")
 
     def shutdown(self):
+        self.player.close()
+        if self.system_pool:
+            self.system_pool.shutdown()
         if self.engine_type == 'system' or self.engine_type == 'System Voice (SAPI)' and self.ttsx_engine:
             self.ttsx_engine.stop()
 
@@ -276,33 +1433,6 @@ class VoiceManager(QObject):
             logging.debug(f"{engine_name}_voices.json couldnt be found")
             return []
 
-    def on_word_boundary(self, word_info):
-        logging.debug(f"Word boundary event received: {word_info}")
-        if not word_info or 'word' not in word_info:
-            logging.warning("Invalid word_info received in on_word_boundary")
-            return
-
-        try:
-            word = word_info['word']
-            start_pos = word_info.get('start_pos', -1)
-            end_pos = word_info.get('end_pos', -1)
-            
-            if start_pos >= 0 and end_pos >= 0:
-                logging.debug(f"Highlighting word: {word} at positions {start_pos}-{end_pos}")
-                self.wordSpoken.emit(start_pos, end_pos)
-            else:
-                # Try fuzzy search if positions are not provided
-                text = self.textEdit.toPlainText()
-                matches = find_word_positions(text, word)
-                if matches:
-                    pos = matches[0]  # Use the first match
-                    logging.debug(f"Found word '{word}' using fuzzy search at position {pos}")
-                    self.wordSpoken.emit(pos, pos + len(word))
-                else:
-                    logging.warning(f"Could not find word '{word}' in text")
-        except Exception as e:
-            logging.error(f"Error processing word boundary: {e}", exc_info=True)
-
 
 class ConfigManager():
     def __init__(self):
@@ -447,45 +1577,224 @@ class SettingsDialog(QDialog):
             self.colorButton.setText(color.name())
 
 
+class ProfilingSession():
+    """Profiles one reading session and writes a self-contained report bundle.
+
+    Each thread taking part opens a section with wall and CPU timers and its
+    own cProfile profiler. On Python 3.12+ only one profiler may run and it
+    sees every thread, so one session-wide profiler is written as all_threads
+    instead. tracemalloc snapshots bracket the whole session and mark()
+    records when key events first and last happened.
+    finish() writes a zip with report.json, per-section .prof and pstats text,
+    and the top memory growth, so bundles can be attached to tickets and
+    compared between versions.
+    """
+
+    # Python 3.12+ profiles through sys.monitoring: one profiler at a time, covering every thread
+    SHARED_PROFILER = sys.version_info >= (3, 12)
+
+    def __init__(self, folder='profiles'):
+        self.folder = folder
+        self.started = time.perf_counter()
+        self.created = time.strftime('%Y%m%d-%H%M%S')
+        self.sections = {}
+        self.open_sections = {}
+        self.marks = {}
+        self.lock = threading.Lock()
+        self.owns_tracemalloc = not tracemalloc.is_tracing()
+        if self.owns_tracemalloc:
+            tracemalloc.start(10)
+        self.snapshot = tracemalloc.take_snapshot()
+        self.profile = self.start_profile('all_threads') if self.SHARED_PROFILER else None
+
+    def start_profile(self, name):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            logging.warning(f"Profiling {name} without cProfile: {e}")
+            return None
+        return profile
+
+    def begin(self, name):
+        profile = None if self.SHARED_PROFILER else self.start_profile(name)
+        key = (threading.get_ident(), name)
+        self.open_sections[key] = (profile, time.perf_counter(), time.thread_time())
+
+    def end(self, name):
+        key = (threading.get_ident(), name)
+        if key not in self.open_sections:
+            return
+        profile, wall, cpu = self.open_sections.pop(key)
+        cpu = time.thread_time() - cpu
+        wall = time.perf_counter() - wall
+        if profile:
+            profile.disable()
+        with self.lock:
+            self.sections[name] = {
+                'thread': threading.current_thread().name,
+                'wall_seconds': round(wall, 6),
+                'cpu_seconds': round(cpu, 6),
+                'profile': profile,
+            }
+
+    @contextlib.contextmanager
+    def section(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def mark(self, name):
+        elapsed = round(time.perf_counter() - self.started, 6)
+        with self.lock:
+            mark = self.marks.setdefault(name, {'first': elapsed, 'count': 0})
+            mark['last'] = elapsed
+            mark['count'] += 1
+
+    def finish(self, details=None):
+        """Close any open sections on this thread, write the bundle and return its path"""
+        for thread_id, name in list(self.open_sections):
+            if thread_id == threading.get_ident():
+                self.end(name)
+        if self.profile:
+            self.profile.disable()
+        profiles = [(name, section['profile']) for name, section in self.sections.items() if section['profile']]
+        if self.profile:
+            profiles.append(('all_threads', self.profile))
+        growth = tracemalloc.take_snapshot().compare_to(self.snapshot, 'lineno')
+        current, peak = tracemalloc.get_traced_memory()
+        if self.owns_tracemalloc:
+            tracemalloc.stop()
+
+        report = {
+            'created': self.created,
+            'python': sys.version,
+            'platform': platform.platform(),
+            'total_seconds': round(time.perf_counter() - self.started, 6),
+            'details': details or {},
+            'profiles': 'session-wide, all threads' if self.SHARED_PROFILER else 'per thread section',
+            'marks': self.marks,
+            'sections': {name: {key: value for key, value in section.items() if key != 'profile'}
+                         for name, section in self.sections.items()},
+            'memory': {
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top_growth': [{'where': str(stat.traceback), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                               for stat in growth[:25]],
+            },
+        }
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder, f"pyReadAloud-profile-{self.created}.zip")
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr('report.json', json.dumps(report, indent=4))
+            for name, profile in profiles:
+                profile.create_stats()
+                # Same format as Profile.dump_stats, loadable with pstats.Stats
+                bundle.writestr(f"{name}.prof", marshal.dumps(profile.stats))
+                text = io.StringIO()
+                pstats.Stats(profile, stream=text).sort_stats('cumulative').print_stats(40)
+                bundle.writestr(f"{name}.txt", text.getvalue())
+        logging.info(f"Profiling report written to {path}")
+        return path
+
+
 class SpeechThread(QThread):
     finished = pyqtSignal()
 
-    def __init__(self, text, voiceManager, parent=None):
+    def __init__(self, text, voiceManager, parent=None, offset=0, profiling=None):
         super(SpeechThread, self).__init__(parent)
-        self.text = text
+        self.text = text  # A string or a DocumentSource read from byte offset
+        self.offset = offset
         self.voiceManager = voiceManager
+        self.profiling = profiling
 
     def run(self):
+        profiling = self.profiling.section('speech_thread') if self.profiling else contextlib.nullcontext()
+        with profiling:
+            self.speak()
+        self.finished.emit()  # Signal that the speech has finished
+
+    def speak(self):
         try:
+            if isinstance(self.text, DocumentSource):
+                logging.info(f"Speech thread starting with document: {self.text.path}")
+                self.voiceManager.speak_document(self.text, self.offset)
+                return
             logging.info(f"Speech thread starting with text: {self.text[:100]}...")
             self.voiceManager.speak_threaded(self.text)
             logging.info("Speech thread completed")
         except Exception as e:
             logging.error(f"Error in speech thread: {e}", exc_info=True)
-        finally:
-            self.finished.emit()  # Signal that the speech has finished
+
+
+class PlaybackHighlighter(QObject):
+    """Highlights the word being heard by polling the playback clock on a frame-rate timer.
+
+    Nothing crosses threads per word: the speech thread only fills the timing
+    table, and if timings arrive late the last known word simply stays lit.
+    """
+
+    def __init__(self, voiceManager, highlight, interval=33, parent=None):
+        super(PlaybackHighlighter, self).__init__(parent)
+        self.voiceManager = voiceManager
+        self.highlight = highlight
+        self.current = -1
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.current = -1
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.current = -1
+
+    def tick(self):
+        timings = self.voiceManager.timings
+        index = timings.word_at_time(self.voiceManager.playback_position())
+        if index >= 0 and index != self.current:
+            self.current = index
+            self.highlight(*timings.span(index))
 
 
 class TextToSpeechApp(QMainWindow):
-    def __init__(self, configManager=None):
+    def __init__(self, configManager=None, profile=False):
         super().__init__()
+        self.profile = profile
+        self.profiling = None
+        self.highlight_color = QColor('#FFFF00')
+        self.text_offset = 0  # Document position of the text being read
+        self.document = None  # DocumentSource when a large file is paged in
+        self.window_start = 0  # Byte offset of the paged-in window
         self.initUI()
-        self.voiceManager = VoiceManager()
-        self.voiceManager.wordSpoken.connect(self.highlight_text)
         self.configManager = configManager or ConfigManager()
-        self.load_config()
+        self.voiceManager = VoiceManager(self.configManager)
+        self.highlighter = PlaybackHighlighter(self.voiceManager, self.highlight_text, parent=self)
+        self.voiceManager.speechStarted.connect(self.on_speech_started)
+        self.voiceManager.speakCompleted.connect(self.on_speak_completed)
+        self.apply_settings(self.configManager.settings)
 
     def highlight_text(self, start, end):
         """Highlight the specified text range"""
         try:
-            cursor = self.textEdit.textCursor()
-            cursor.setPosition(start)
-            cursor.setPosition(end, QTextCursor.KeepAnchor)
-            format = cursor.charFormat()
-            format.setBackground(QColor(255, 255, 0))  # Yellow highlight
-            cursor.mergeCharFormat(format)
-            self.textEdit.setTextCursor(cursor)
-            logging.info("Successfully highlighted text")
+            if self.profiling:
+                self.profiling.mark('highlight')
+            if self.document and self.text_offset + end > self.textEdit.document().characterCount() - 1:
+                # Reading has moved past the paged-in window: page in the sentence being read
+                char_offset, byte_offset = self.voiceManager.segment_at_char(start)
+                self.show_window(byte_offset)
+                self.text_offset = -char_offset
+            # Extra selections leave the document and its undo stack untouched
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = self.textEdit.textCursor()
+            selection.cursor.setPosition(self.text_offset + start)
+            selection.cursor.setPosition(self.text_offset + end, QTextCursor.KeepAnchor)
+            selection.format.setBackground(self.highlight_color)
+            self.textEdit.setExtraSelections([selection])
         except Exception as e:
             logging.error(f"Error highlighting text: {e}", exc_info=True)
 
@@ -494,8 +1803,15 @@ class TextToSpeechApp(QMainWindow):
         cursor = self.textEdit.textCursor()
         if cursor.hasSelection():
             text = cursor.selectedText()
+            self.text_offset = cursor.selectionStart()
+        elif self.document:
+            # Read the paged document on from the visible window
+            self.text_offset = 0
+            self.start_speech(self.document, self.window_start)
+            return
         else:
             text = self.textEdit.toPlainText()
+            self.text_offset = 0
             
         if text.strip():
             logging.info(f"Starting to read text: {text[:100]}...")
@@ -503,16 +1819,87 @@ class TextToSpeechApp(QMainWindow):
         else:
             logging.warning("No text to read")
 
-    def start_speech(self, text):
+    def start_speech(self, text, offset=0):
         """Start the speech synthesis"""
+        if self.profile_action.isChecked() and not self.profiling:
+            self.profiling = ProfilingSession()
+            self.profiling.begin('ui_thread')
+            self.voiceManager.profiling = self.profiling
         try:
             # Create a new thread for speech
-            self.speech_thread = SpeechThread(text, self.voiceManager)
+            self.speech_thread = SpeechThread(text, self.voiceManager, offset=offset, profiling=self.profiling)
+            self.speech_thread.finished.connect(self.finish_profiling)
+            self.speech_thread.finished.connect(self.on_reading_finished)
             self.speech_thread.finished.connect(self.speech_thread.deleteLater)
+            # Highlight offsets are relative to the window being read, so it must stay put until the reading ends
+            self.pageBar.setEnabled(False)
+            self.button_open.setEnabled(False)
             self.speech_thread.start()
             logging.info("Speech thread started")
         except Exception as e:
             logging.error(f"Error starting speech: {e}", exc_info=True)
+            self.on_reading_finished()
+
+    def on_reading_finished(self):
+        self.pageBar.setEnabled(True)
+        self.button_open.setEnabled(True)
+
+    def finish_profiling(self):
+        """Write the report once the speech thread and its last highlight are done"""
+        if not self.profiling:
+            return
+        settings = self.configManager.settings
+        details = {
+            'engine': self.voiceManager.engine_type,
+            'voice': (settings.get('voice_details') or {}).get('id'),
+            'speech_rate': settings.get('speech_rate'),
+            'text_characters': self.textEdit.document().characterCount(),
+            'document_bytes': self.document.size if self.document else None,
+            'words_timed': len(self.voiceManager.timings),
+        }
+        try:
+            path = self.profiling.finish(details)
+            self.statusBar().showMessage(f"Profile saved to {os.path.abspath(path)}")
+        except Exception as e:
+            logging.error(f"Error writing profiling report: {e}", exc_info=True)
+        finally:
+            self.profiling = self.voiceManager.profiling = None
+
+    def open_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Open Text File', '', 'Text files (*.txt);;All files (*)')
+        if path:
+            self.load_file(path)
+
+    def load_file(self, path, paging_threshold=1024 * 1024):
+        """Load a text file, paging it in a window at a time if it is large"""
+        if self.document:
+            self.document.close()
+            self.document = None
+        if os.path.getsize(path) < paging_threshold:
+            with open(path, 'r', encoding='utf-8', errors='replace') as file:
+                self.textEdit.setPlainText(file.read())
+            self.textEdit.setReadOnly(False)
+            self.pageBar.setVisible(False)
+            return
+        self.document = DocumentSource(path)
+        self.textEdit.setReadOnly(True)  # Windows cannot be written back to the file
+        self.pageBar.setRange(0, self.document.size // 1024)
+        self.pageBar.setPageStep(self.document.window // 1024)
+        self.pageBar.setVisible(True)
+        self.show_window(0)
+        logging.info(f"Paging {self.document.size} bytes from {path}")
+
+    def show_window(self, offset):
+        """Replace the editor contents with the document window at byte offset"""
+        self.window_start, end, text = self.document.window_at(offset)
+        self.textEdit.setPlainText(text)
+        self.textEdit.setExtraSelections([])
+        self.pageBar.blockSignals(True)
+        self.pageBar.setValue(self.window_start // 1024)
+        self.pageBar.blockSignals(False)
+
+    def on_page_scrolled(self, value):
+        self.show_window(value * 1024)
 
     def extract_sentence(self, text, pos):
         # Find the nearest sentence around the cursor position
@@ -548,24 +1935,20 @@ class TextToSpeechApp(QMainWindow):
         """Handle speech start event"""
         logging.debug("Speech started in UI")
         # Clear any previous highlighting
-        cursor = self.textEdit.textCursor()
-        cursor.select(QTextCursor.Document)
-        format = cursor.charFormat()
-        format.setBackground(QColor("transparent"))
-        cursor.mergeCharFormat(format)
+        self.textEdit.setExtraSelections([])
+        self.highlighter.start()
 
     def on_speak_completed(self, text):
         """Handle speech completion"""
         logging.debug("Speech completed in UI")
         # Clear highlighting
-        cursor = self.textEdit.textCursor()
-        cursor.select(QTextCursor.Document)
-        format = cursor.charFormat()
-        format.setBackground(QColor("transparent"))
-        cursor.mergeCharFormat(format)
+        self.highlighter.stop()
+        self.textEdit.setExtraSelections([])
             
     def closeEvent(self, event):
         self.voiceManager.shutdown()
+        if self.document:
+            self.document.close()
         event.accept()
 
     def reset_highlight(self):
@@ -586,15 +1969,27 @@ class TextToSpeechApp(QMainWindow):
         self.setWindowTitle('Text-to-Speech App')
         self.setGeometry(100, 100, 480, 320)
 
+        # Tools menu
+        self.profile_action = QAction('Profile Readings', self, checkable=True)
+        self.profile_action.setChecked(self.profile)
+        toolsMenu = self.menuBar().addMenu('Tools')
+        toolsMenu.addAction(self.profile_action)
+
         # Main layout and widgets
         mainLayout = QVBoxLayout()
         widget = QWidget(self)
         widget.setLayout(mainLayout)
         self.setCentralWidget(widget)
 
-        # Text edit field
+        # Text edit field, with a bar to page through large files
         self.textEdit = QTextEdit()
-        mainLayout.addWidget(self.textEdit)
+        self.pageBar = QScrollBar(Qt.Vertical)
+        self.pageBar.valueChanged.connect(self.on_page_scrolled)
+        self.pageBar.setVisible(False)
+        textLayout = QHBoxLayout()
+        textLayout.addWidget(self.textEdit)
+        textLayout.addWidget(self.pageBar)
+        mainLayout.addLayout(textLayout)
 
         # Radio buttons for reading modes
         self.radio_sentence = QRadioButton("Read Sentence", self)
@@ -609,6 +2004,11 @@ class TextToSpeechApp(QMainWindow):
         radio_layout.addWidget(self.radio_all)
         mainLayout.addLayout(radio_layout)
 
+        # Open button
+        self.button_open = QPushButton('Open...', self)
+        self.button_open.clicked.connect(self.open_file)
+        mainLayout.addWidget(self.button_open)
+
         # Read button
         self.button_read = QPushButton('Read', self)
         self.button_read.clicked.connect(self.read_text)
@@ -621,24 +2021,386 @@ class TextToSpeechApp(QMainWindow):
 
         self.show()
 
-def find_word_positions(text, word):
-    matches = []
-    for i in range(len(text)):
-        if text[i:i+len(word)] == word:
-            matches.append(i)
-    return matches
+class EnginePool():
+    """Keeps warm VoiceManagers per engine/voice/rate so requests skip engine start-up.
+
+    At most max_engines are kept; past that the least recently used idle one
+    is shut down. All of them share one audio cache, so its size cap holds.
+    """
+
+    def __init__(self, configManager, max_engines=4):
+        self.configManager = configManager
+        self.max_engines = max_engines
+        self.managers = collections.OrderedDict()  # key -> (voiceManager, lock, users)
+        self.lock = threading.Lock()
+        self.cache = AudioCache.from_settings(configManager.settings)
+
+    @contextlib.contextmanager
+    def using(self, engine_type, voice_id=None, lang=None, rate=None):
+        """Yield (voiceManager, lock); callers must hold the lock while synthesizing"""
+        key = (engine_type, voice_id, lang, rate)
+        with self.lock:
+            if key not in self.managers:
+                self.evict(self.max_engines - 1)
+                config = copy.copy(self.configManager)
+                config.settings = dict(self.configManager.settings)
+                if voice_id:
+                    config.settings['voice_details'] = {'id': voice_id, 'lang': lang}
+                if rate:
+                    config.settings['speech_rate'] = rate
+                manager = VoiceManager(config, self.cache)
+                manager.init_engine(engine_type)
+                self.managers[key] = (manager, threading.Lock(), 0)
+                logging.info(f"Engine pool warmed {key}")
+            manager, engine_lock, users = self.managers[key]
+            self.managers[key] = (manager, engine_lock, users + 1)
+            self.managers.move_to_end(key)
+        try:
+            yield manager, engine_lock
+        finally:
+            with self.lock:
+                manager, engine_lock, users = self.managers[key]
+                self.managers[key] = (manager, engine_lock, users - 1)
+
+    def evict(self, keep):
+        """Shut down least recently used idle managers until at most keep remain; call with the lock held"""
+        for key, (manager, engine_lock, users) in list(self.managers.items()):
+            if len(self.managers) <= keep:
+                return
+            if users:
+                continue
+            del self.managers[key]
+            manager.shutdown()
+            logging.info(f"Engine pool released {key}")
+
+
+class SynthesisJob():
+    """A synthesis in flight whose events are streamed to every client asking for the same text.
+
+    Events stay buffered only until every subscriber has read them, and the
+    producer waits while max_buffered events are unread, so synthesis runs no
+    further ahead than the slowest client. Clients can join while the first
+    event is still buffered; after that an identical request starts its own job.
+    """
+
+    def __init__(self, key, max_buffered=64):
+        self.key = key
+        self.events = collections.deque()
+        self.first = 0  # Index of events[0] among all events published
+        self.cursors = {}  # subscriber -> index of the next event it will read
+        self.next_subscriber = 0
+        self.max_buffered = max_buffered
+        self.running = False
+        self.progress = time.monotonic()  # When the job last started or published
+        self.done = False
+        self.condition = threading.Condition()
+
+    def start(self):
+        """Mark the job as holding a synthesis slot, so stalls are timed from now"""
+        with self.condition:
+            self.running = True
+            self.progress = time.monotonic()
+
+    def subscribe(self):
+        """Return a subscriber id reading from the first event, or None if that event is gone"""
+        with self.condition:
+            if self.first > 0 or self.done:
+                return None
+            self.next_subscriber += 1
+            self.cursors[self.next_subscriber] = 0
+            return self.next_subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.condition:
+            self.cursors.pop(subscriber, None)
+            self.trim()
+            self.condition.notify_all()
+
+    def trim(self):
+        """Drop events every subscriber has read"""
+        oldest = min(self.cursors.values(), default=self.first + len(self.events))
+        while self.first < oldest and self.events:
+            self.events.popleft()
+            self.first += 1
+
+    def publish(self, event):
+        """Buffer an event, waiting while the buffer is full; False once every subscriber has gone"""
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.events) < self.max_buffered or not self.cursors)
+            if not self.cursors:
+                return False
+            self.events.append(event)
+            self.progress = time.monotonic()
+            self.condition.notify_all()
+            return True
+
+    def finish(self):
+        with self.condition:
+            self.done = True
+            self.condition.notify_all()
+
+    def stream(self, subscriber, timeout=60):
+        """Yield events as they are published, from the first one, until the job finishes.
+
+        A job still waiting for a synthesis slot can wait indefinitely; once it
+        runs, timeout seconds without an event ends the stream with an error event.
+        """
+        while True:
+            with self.condition:
+                cursor = self.cursors[subscriber]
+                ready = lambda: cursor < self.first + len(self.events) or self.done
+                if not self.condition.wait_for(ready, timeout):
+                    if not self.running or time.monotonic() - self.progress < timeout:
+                        continue
+                    logging.error(f"Synthesis job stalled for {timeout}s")
+                    yield {'type': 'error', 'message': f"No synthesis progress for {timeout}s"}
+                    return
+                pending = list(self.events)[cursor - self.first:]
+                done = self.done
+                self.cursors[subscriber] = cursor + len(pending)
+                self.trim()
+                self.condition.notify_all()
+            for event in pending:
+                yield event
+            if done and not pending:
+                return
+
+
+class SynthesisServer(ThreadingHTTPServer):
+    """Local HTTP server streaming audio chunks and word events as newline-delimited JSON.
+
+    POST /synthesize {"text", "engine", "voice", "lang", "rate"} streams events;
+    GET /health returns counters. Identical concurrent requests share one synthesis.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, enginePool, max_jobs=4, max_pending=16):
+        super(SynthesisServer, self).__init__(address, SynthesisRequestHandler)
+        self.enginePool = enginePool
+        self.normalizer = TextNormalizer()
+        self.jobs = {}  # key -> the job new requests for it can still join
+        self.active_jobs = 0
+        self.jobs_lock = threading.Lock()
+        self.job_slots = threading.BoundedSemaphore(max_jobs)
+        self.max_pending = max_pending
+        self.started = time.time()
+        self.metrics = {
+            'requests': 0,
+            'coalesced': 0,
+            'rejected': 0,
+            'errors': 0,
+            'bytes_sent': 0,
+            'audio_seconds': 0.0,
+            'synthesis_seconds': 0.0,
+        }
+        self.metrics_lock = threading.Lock()
+
+    def count(self, name, amount=1):
+        with self.metrics_lock:
+            self.metrics[name] += amount
+
+    def health(self):
+        with self.metrics_lock:
+            metrics = dict(self.metrics)
+        with self.jobs_lock:
+            metrics['jobs_in_flight'] = self.active_jobs
+        metrics['status'] = 'ok'
+        metrics['uptime'] = round(time.time() - self.started, 3)
+        metrics['warm_engines'] = len(self.enginePool.managers)
+        return metrics
+
+    def submit(self, text, engine_type, voice_id=None, lang=None, rate=None):
+        """Return (job, subscriber) for this request, or None if the server is saturated"""
+        key = (engine_type, voice_id, lang, rate, text)
+        self.count('requests')
+        with self.jobs_lock:
+            job = self.jobs.get(key)
+            subscriber = job.subscribe() if job else None
+            if subscriber:
+                self.count('coalesced')
+                return job, subscriber
+            if self.active_jobs >= self.max_pending:
+                self.count('rejected')
+                return None
+            job = SynthesisJob(key)
+            subscriber = job.subscribe()
+            self.jobs[key] = job
+            self.active_jobs += 1
+        threading.Thread(target=self.run_job, args=(job,), daemon=True).start()
+        return job, subscriber
+
+    def run_job(self, job):
+        engine_type, voice_id, lang, rate, text = job.key
+        try:
+            with self.job_slots, self.enginePool.using(engine_type, voice_id, lang, rate) as (manager, engine_lock):
+                job.start()
+                offset = 0.0
+                table = WordTimingTable()
+                for match in SENTENCE_RE.finditer(text):
+                    started = time.perf_counter()
+                    with engine_lock:
+                        audio_bytes, sample_rate, sentence_table = next(manager.synthesize_many([match.group()]))
+                    self.count('synthesis_seconds', time.perf_counter() - started)
+                    duration = len(audio_bytes) / 2 / sample_rate
+                    events = [{
+                        'type': 'audio',
+                        'time': round(offset, 3),
+                        'sample_rate': sample_rate,
+                        'data': base64.b64encode(audio_bytes).decode('ascii'),
+                    }]
+                    first = len(table)
+                    table.extend(sentence_table, offset, match.start())
+                    for index in range(first, len(table)):
+                        events.append({
+                            'type': 'word',
+                            'start': table.char_start[index],
+                            'end': table.char_end[index],
+                            'start_time': round(table.time_start[index], 3),
+                            'end_time': round(table.time_end[index], 3),
+                        })
+                    if not all(job.publish(event) for event in events):
+                        logging.debug("Every client left, abandoning synthesis job")
+                        return
+                    offset += duration
+                    self.count('audio_seconds', duration)
+                job.publish({'type': 'end', 'duration': round(offset, 3)})
+        except Exception as e:
+            logging.error(f"Error in synthesis job: {e}", exc_info=True)
+            self.count('errors')
+            job.publish({'type': 'error', 'message': str(e)})
+        finally:
+            with self.jobs_lock:
+                if self.jobs.get(job.key) is job:
+                    del self.jobs[job.key]
+                self.active_jobs -= 1
+            job.finish()
+
+
+class SynthesisRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = 60  # Socket timeout, so a client that stops reading releases its job
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path in ('/health', '/metrics'):
+            self.send_json(200, self.server.health())
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/synthesize':
+            self.send_json(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self.send_json(400, {'error': 'invalid JSON body'})
+            return
+        error = self.validate(request)
+        if error:
+            self.send_json(400, {'error': error})
+            return
+        engine_type = request.get('engine') or self.server.enginePool.configManager.settings.get('tts_engine', 'System Voice (SAPI)')
+        # Requests differing only in whitespace, quotes or Unicode form share a job
+        normalized = self.server.normalizer.normalize(request['text'])
+        submitted = self.server.submit(normalized.text, engine_type, request.get('voice'), request.get('lang'), request.get('rate'))
+        if submitted is None:
+            self.send_json(503, {'error': 'server busy'}, {'Retry-After': '1'})
+            return
+        job, subscriber = submitted
+
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            # Writes block on slow clients, and the job waits for its slowest reader
+            for event in job.stream(subscriber):
+                if event['type'] == 'word':
+                    event = dict(event)
+                    event['start'], event['end'] = normalized.original_span(event['start'], event['end'])
+                line = json.dumps(event).encode('utf-8') + b'\n'
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+                self.server.count('bytes_sent', len(line))
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            logging.debug("Client disconnected during synthesis stream")
+        except TimeoutError:
+            logging.debug("Client stopped reading the synthesis stream")
+            self.close_connection = True
+        finally:
+            job.unsubscribe(subscriber)
+
+    @staticmethod
+    def validate(request):
+        """Return why a /synthesize body is unusable, or None"""
+        if not isinstance(request, dict):
+            return 'body must be a JSON object'
+        text = request.get('text')
+        if not isinstance(text, str) or not text.strip():
+            return 'no text to synthesize'
+        for name in ('engine', 'voice', 'lang'):
+            if request.get(name) is not None and not isinstance(request[name], str):
+                return f'{name} must be a string'
+        rate = request.get('rate')
+        if rate is not None and (isinstance(rate, bool) or not isinstance(rate, int) or not 50 <= rate <= 500):
+            return 'rate must be an integer from 50 to 500'
+        return None
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+def run_server(configManager, host='127.0.0.1', port=8765, max_jobs=4, max_pending=16, max_engines=4):
+    """Run the synthesis server headless until interrupted"""
+    server = SynthesisServer((host, port), EnginePool(configManager, max_engines), max_jobs, max_pending)
+    logging.info(f"Synthesis server listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Synthesis server stopping")
+    finally:
+        server.server_close()
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Read text aloud with highlighting")
+    parser.add_argument('--server', action='store_true', help="run the synthesis server headless instead of the UI")
+    parser.add_argument('--host', default='127.0.0.1', help="server bind address")
+    parser.add_argument('--port', type=int, default=8765, help="server port")
+    parser.add_argument('--max-jobs', type=int, default=4, help="concurrent synthesis jobs")
+    parser.add_argument('--max-pending', type=int, default=16, help="queued jobs before requests are refused")
+    parser.add_argument('--max-engines', type=int, default=4, help="warm engine/voice/rate combinations kept")
+    parser.add_argument('--profile', action='store_true', default=os.environ.get('PYREADALOUD_PROFILE') == '1',
+                        help="write a profiling report for each reading (or set PYREADALOUD_PROFILE=1)")
+    # Leave unknown arguments for Qt
+    return parser.parse_known_args(argv)
 
 def main():
+    multiprocessing.freeze_support()
     logging.info("Starting the application")
+    args, qt_args = parse_args(sys.argv[1:])
     configManager = ConfigManager()
     logging.info("Loaded config Manager")
-    app = QApplication(sys.argv)
+    if args.server:
+        run_server(configManager, args.host, args.port, args.max_jobs, args.max_pending, args.max_engines)
+        return
+    app = QApplication(sys.argv[:1] + qt_args)
     # Set font substitutions
     QFont.insertSubstitution("MS Shell Dlg 2", "Segoe UI")
     QFont.insertSubstitution("MS UI Gothic", "Yu Gothic")
     QFont.insertSubstitution("SimSun", "Microsoft YaHei")
     # Optionally set a default font
-    ex = TextToSpeechApp(configManager)
+    ex = TextToSpeechApp(configManager, profile=args.profile)
     logging.info("Finishing the application")
     sys.exit(app.exec_())
     
@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pytest
+
+from pyReadAloud import AUDIO_CODECS, AudioCache, WordTimingTable
+
+SAMPLE_RATE = 22050
+VOICE_KEY = ("sapi", "voice", 150)
+
+
+def speech_like(frames=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    time = np.arange(frames) / SAMPLE_RATE
+    samples = 9000 * np.sin(2 * np.pi * 220 * time) + rng.normal(0, 400, frames)
+    samples[:50] = [32767, -32768] * 25  # Full-scale swings wrap in int16 deltas
+    return np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+
+
+def decode(codec, payload, block_size=65536):
+    return b"".join(codec.decode(memoryview(payload), SAMPLE_RATE, block_size))
+
+
+@pytest.mark.parametrize("name", [name for name in ("pcm", "zlib", "flac") if name in AUDIO_CODECS])
+@pytest.mark.parametrize("block_size", [1000, 65536])
+def test_lossless_codecs_round_trip(name, block_size):
+    codec = AUDIO_CODECS[name]
+    audio_bytes = speech_like()
+    assert decode(codec, codec.encode(audio_bytes, SAMPLE_RATE), block_size) == audio_bytes
+
+
+@pytest.mark.skipif("adpcm" not in AUDIO_CODECS, reason="audioop is not available")
+def test_adpcm_is_close_and_a_quarter_of_the_size():
+    codec = AUDIO_CODECS["adpcm"]
+    audio_bytes = speech_like()
+    payload = codec.encode(audio_bytes, SAMPLE_RATE)
+    assert len(payload) == len(audio_bytes) // 4
+    # Decoding block by block carries the predictor state, so it matches one whole decode
+    decoded = decode(codec, payload, 1000)
+    assert decoded == decode(codec, payload)
+    original = np.frombuffer(audio_bytes, dtype=np.int16)[100:].astype(float)
+    error = np.frombuffer(decoded, dtype=np.int16)[100:] - original
+    assert np.sqrt(np.mean(error ** 2)) < 0.1 * np.sqrt(np.mean(original ** 2))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AudioCache(str(tmp_path), "zlib")
+
+
+def make_table():
+    table = WordTimingTable()
+    table.append(0, 5, 0.0, 0.4)
+    table.append(6, 11, 0.5, 0.9)
+    return table
+
+
+def test_cache_round_trip(cache):
+    audio_bytes = speech_like()
+    cache.put(VOICE_KEY, "Hello world", audio_bytes, SAMPLE_RATE, make_table())
+    cache.writes.join()
+    cached_audio, sample_rate, table = cache.get(VOICE_KEY, "Hello world")
+    assert (cached_audio, sample_rate) == (audio_bytes, SAMPLE_RATE)
+    assert [table.span(i) for i in range(len(table))] == [(0, 5), (6, 11)]
+    assert cache.get(VOICE_KEY, "Hello there") is None
+    assert cache.get(("sapi", "voice", 200), "Hello world") is None
+
+
+def test_cache_header(cache):
+    table = make_table()
+    cache.put(VOICE_KEY, "Hello world", speech_like(), SAMPLE_RATE, table)
+    cache.writes.join()
+    with open(cache.path(VOICE_KEY, "Hello world"), "rb") as file:
+        data = file.read()
+    magic, codec, sample_rate, timings_size = AudioCache.HEADER.unpack_from(data)
+    assert (magic, codec.rstrip(b"\0"), sample_rate) == (b"PRA1", b"zlib", SAMPLE_RATE)
+    assert data[AudioCache.HEADER.size:AudioCache.HEADER.size + timings_size] == b"".join(table.buffers())
+
+
+def test_silent_sentence_has_empty_payload(cache):
+    cache.put(VOICE_KEY, "...", b"", SAMPLE_RATE, WordTimingTable())
+    cache.writes.join()
+    path = cache.path(VOICE_KEY, "...")
+    with open(path, "rb") as file:
+        data = file.read()
+    assert len(data) == AudioCache.HEADER.size + AudioCache.HEADER.unpack_from(data)[3]
+    audio_bytes, sample_rate, table = cache.get(VOICE_KEY, "...")
+    assert (audio_bytes, sample_rate, len(table)) == (b"", SAMPLE_RATE, 0)
+
+
+def test_bad_entries_are_misses(cache):
+    cache.put(VOICE_KEY, "Hello world", speech_like(), SAMPLE_RATE, make_table())
+    cache.writes.join()
+    path = cache.path(VOICE_KEY, "Hello world")
+    with open(path, "r+b") as file:
+        file.write(b"XXXX")
+    assert cache.get(VOICE_KEY, "Hello world") is None
+
+
+def test_eviction_keeps_recently_read(tmp_path):
+    audio_bytes = speech_like(4000)
+    cache = AudioCache(str(tmp_path), "pcm", max_bytes=5 * len(audio_bytes))
+    for index in range(4):
+        cache.put(VOICE_KEY, f"Sentence {index}", audio_bytes, SAMPLE_RATE, make_table())
+        cache.writes.join()
+        os.utime(cache.path(VOICE_KEY, f"Sentence {index}"), (1000 + index, 1000 + index))
+    assert cache.get(VOICE_KEY, "Sentence 0") is not None  # Now the most recently used
+    cache.put(VOICE_KEY, "Sentence 4", audio_bytes, SAMPLE_RATE, make_table())
+    cache.writes.join()
+    assert cache.size <= 5 * len(audio_bytes)
+    assert cache.get(VOICE_KEY, "Sentence 0") is not None
+    assert cache.get(VOICE_KEY, "Sentence 1") is None
+    assert cache.get(VOICE_KEY, "Sentence 3") is not None
@@ -0,0 +1,66 @@
+import pytest
+
+from pyReadAloud import DocumentSource
+
+TEXT = "First one. Second été here!\nThird line — no stop\nFourth, 中文 ok? Last."
+
+
+@pytest.fixture
+def open_source(tmp_path):
+    sources = []
+
+    def open_source(data, window=24):
+        path = tmp_path / "doc.txt"
+        path.write_bytes(data)
+        sources.append(DocumentSource(str(path), window=window))
+        return sources[-1]
+
+    yield open_source
+    for source in sources:
+        source.close()
+
+
+def check_segments(source, shown):
+    segments = list(source.segments())
+    assert [text for _, _, text in segments] == ["First one.", "Second été here!", "Third line — no stop",
+                                                 "Fourth, 中文 ok?", "Last."]
+    for char_offset, byte_offset, text in segments:
+        # Char offsets index the text as the editor shows it, byte offsets start a window at the sentence
+        assert shown[char_offset:char_offset + len(text)] == text
+        assert source.window_at(byte_offset, 1024)[2].startswith(text)
+
+
+@pytest.mark.parametrize("window", [24, 40, 1024])
+def test_segment_offsets_across_windows(open_source, window):
+    check_segments(open_source(TEXT.encode("utf-8"), window), TEXT)
+
+
+@pytest.mark.parametrize("window", [24, 40, 1024])
+def test_crlf_folds_like_the_editor(open_source, window):
+    source = open_source(TEXT.replace("\n", "\r\n").encode("utf-8"), window)
+    check_segments(source, TEXT)
+    assert source.window_at(0, 1024)[2] == TEXT
+
+
+def test_windows_never_split_crlf_or_characters(open_source):
+    data = TEXT.replace("\n", "\r\n").encode("utf-8")
+    source = open_source(data)
+    for offset in range(len(data) + 1):
+        start = source.boundary(offset)
+        assert start <= offset
+        assert not data[start:].startswith(b"\n")
+        data[start:].decode("utf-8")
+
+
+def test_bom_and_offset(open_source):
+    data = b"\xef\xbb\xbf" + TEXT.encode("utf-8")
+    source = open_source(data)
+    assert source.boundary(0) == 3
+    char_offset, byte_offset, text = next(source.segments(data.index(b"Third")))
+    assert (char_offset, byte_offset, text) == (0, data.index(b"Third"), "Third line — no stop")
+
+
+def test_empty_file(open_source):
+    source = open_source(b"")
+    assert list(source.segments()) == []
+    assert source.window_at(0) == (0, 0, "")
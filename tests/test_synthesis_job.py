@@ -0,0 +1,74 @@
+import threading
+import time
+
+from pyReadAloud import SynthesisJob
+
+
+def test_subscribers_each_read_every_event():
+    job = SynthesisJob('key')
+    first, second = job.subscribe(), job.subscribe()
+    for number in range(3):
+        job.publish({'n': number})
+    job.finish()
+    assert [event['n'] for event in job.stream(first)] == [0, 1, 2]
+    assert [event['n'] for event in job.stream(second)] == [0, 1, 2]
+
+
+def test_events_are_trimmed_once_every_subscriber_has_read_them():
+    job = SynthesisJob('key')
+    fast, slow = job.subscribe(), job.subscribe()
+    job.publish({'n': 0})
+    job.publish({'n': 1})
+    stream = job.stream(fast)
+    next(stream), next(stream)
+    assert len(job.events) == 2
+    job.unsubscribe(slow)
+    assert len(job.events) == 0
+    assert job.first == 2
+
+
+def test_late_subscribers_only_join_before_the_first_event_is_dropped():
+    job = SynthesisJob('key')
+    reader = job.subscribe()
+    job.publish({'n': 0})
+    assert job.subscribe() is not None
+    job.unsubscribe(reader)
+    job.unsubscribe(reader + 1)
+    assert job.subscribe() is None
+
+
+def test_publish_waits_for_the_slowest_subscriber():
+    job = SynthesisJob('key', max_buffered=2)
+    reader = job.subscribe()
+    published = []
+
+    def produce():
+        for number in range(5):
+            job.publish({'n': number})
+            published.append(number)
+        job.finish()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    time.sleep(0.2)
+    assert published == [0, 1]
+    assert [event['n'] for event in job.stream(reader)] == [0, 1, 2, 3, 4]
+    producer.join(1)
+    assert not producer.is_alive()
+
+
+def test_publish_fails_once_every_subscriber_has_gone():
+    job = SynthesisJob('key', max_buffered=1)
+    reader = job.subscribe()
+    assert job.publish({'n': 0})
+    job.unsubscribe(reader)
+    assert not job.publish({'n': 1})
+
+
+def test_queued_job_does_not_time_out_but_a_stalled_one_does():
+    job = SynthesisJob('key')
+    reader = job.subscribe()
+    stream = job.stream(reader, timeout=0.05)
+    threading.Timer(0.2, lambda: (job.start(), job.publish({'type': 'audio'}))).start()
+    assert next(stream) == {'type': 'audio'}
+    assert next(stream)['type'] == 'error'
@@ -0,0 +1,89 @@
+import random
+import unicodedata
+
+from pyReadAloud import TextNormalizer, WordTimingTable
+
+normalizer = TextNormalizer()
+
+
+def offsets(normalized):
+    return [normalized.original(i) for i in range(len(normalized.text) + 1)]
+
+
+def test_clean_text_is_unchanged():
+    normalized = normalizer.normalize("Plain text, nothing to do.\nSecond line.")
+    assert normalized.text == "Plain text, nothing to do.\nSecond line."
+    assert normalized.offsets is None
+    assert normalized.original(5) == 5
+
+
+def test_whitespace_runs_fold_to_one():
+    normalized = normalizer.normalize("a  \t b\u00a0c")
+    assert normalized.text == "a b c"
+    assert offsets(normalized) == [0, 1, 5, 6, 7, 8]
+
+
+def test_line_breaks_survive_folding():
+    normalized = normalizer.normalize("one \r\n  two\u2029three")
+    assert normalized.text == "one\ntwo\nthree"
+    assert normalized.original_span(4, 7) == (8, 11)
+    assert normalized.original_span(8, 13) == (12, 17)
+
+
+def test_invisible_characters_are_dropped():
+    source = "soft\u00adhy\u200bphen\ufeff."
+    normalized = normalizer.normalize(source)
+    assert normalized.text == "softhyphen."
+    assert normalized.original_span(4, 10) == (5, 13)
+    assert normalized.original(6) == source.index("p")
+
+
+def test_quotes_and_dashes_fold_to_ascii():
+    normalized = normalizer.normalize("\u201cIt\u2019s\u201d \u2014 fine")
+    assert normalized.text == "\"It's\" - fine"
+    assert normalized.offsets is None
+
+
+def test_decomposed_text_composes_to_nfc():
+    source = "cafe\u0301 ok"
+    normalized = normalizer.normalize(source)
+    assert normalized.text == "caf\u00e9 ok"
+    # The composed letter maps to its base, the rest keep their positions
+    assert offsets(normalized) == [0, 1, 2, 3, 5, 6, 7, 8]
+
+
+def test_hangul_jamo_compose():
+    source = "\u1100\u1161\u11a8 \uac00\u11a8"
+    normalized = normalizer.normalize(source)
+    assert normalized.text == "\uac01 \uac01"
+    assert offsets(normalized) == [0, 3, 4, 6]
+
+
+def test_mark_after_dropped_invisible_joins_its_base():
+    normalized = normalizer.normalize("e\u200b\u0301 x")
+    assert normalized.text == "\u00e9 x"
+    assert offsets(normalized) == [0, 3, 4, 5]
+
+
+def test_key_ignores_surrounding_space_and_trailing_punctuation():
+    assert normalizer.key("  Plain   text.  ") == normalizer.key("Plain text") == "Plain text"
+
+
+def test_random_text_maps_back_in_order():
+    alphabet = ["a", "e", "\u0301", "\u0323", " ", "  ", "\n", "\u2029", "\u2009", "\u200b",
+                "\u2019", "\u2014", "\u1100", "\u1161", "\u11a8", "\uac00", "\t", "."]
+    rng = random.Random(0)
+    for _ in range(2000):
+        source = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+        normalized = normalizer.normalize(source)
+        mapped = offsets(normalized)
+        assert unicodedata.is_normalized("NFC", normalized.text)
+        assert mapped == sorted(mapped)
+        assert mapped[0] >= 0 and mapped[-1] == len(source)
+
+
+def test_engine_words_match_in_normalized_form():
+    text = normalizer.normalize("He said \u201cdon\u2019t\u201d \u2014 twice.").text
+    table = WordTimingTable()
+    table.add_engine_timings(text, [(0.0, 0.1, "He"), (0.1, 0.2, "said"), (0.2, 0.3, "\u201cdon\u2019t\u201d"), (0.3, 0.4, "twice")])
+    assert [text[slice(*table.span(i))] for i in range(len(table))] == ["He", "said", "don't", "twice"]
@@ -0,0 +1,72 @@
+import struct
+
+import pytest
+
+from pyReadAloud import WordTimingTable
+
+
+def make_table(rows):
+    table = WordTimingTable()
+    for row in rows:
+        table.append(*row)
+    return table
+
+
+ROWS = [(0, 3, 0.0, 0.25), (4, 9, 0.3, 0.6), (10, 14, 0.8, 1.1)]
+
+
+def test_round_trip():
+    table = make_table(ROWS)
+    restored = WordTimingTable.from_buffer(b''.join(table.buffers()))
+    assert len(restored) == 3
+    assert [restored.span(i) for i in range(3)] == [(0, 3), (4, 9), (10, 14)]
+    assert list(restored.time_start) == [0.0, 0.3, 0.8]
+    assert list(restored.time_end) == [0.25, 0.6, 1.1]
+
+
+def test_round_trip_empty():
+    restored = WordTimingTable.from_buffer(b''.join(WordTimingTable().buffers()))
+    assert len(restored) == 0
+    assert restored.word_at_time(1.0) == -1
+    assert restored.time_at_char(5) == 0.0
+
+
+def test_format_is_little_endian():
+    data = b''.join(make_table([(1, 2, 0.5, 1.5)]).buffers())
+    assert data[:12] == b'WTT1' + struct.pack('<Q', 1)
+    assert struct.unpack_from('<qqdd', data, 12) == (1, 2, 0.5, 1.5)
+
+
+def test_from_buffer_rejects_bad_data():
+    with pytest.raises(ValueError):
+        WordTimingTable.from_buffer(b'XXXX' + bytes(8))
+    data = b''.join(make_table(ROWS).buffers())
+    with pytest.raises(ValueError):
+        WordTimingTable.from_buffer(data[:-1])
+
+
+def test_word_at_time_boundaries():
+    table = make_table(ROWS)
+    assert table.word_at_time(-0.1) == -1
+    assert table.word_at_time(0.0) == 0
+    assert table.word_at_time(0.29) == 0
+    assert table.word_at_time(0.3) == 1
+    # Between words the last word started stays current
+    assert table.word_at_time(0.7) == 1
+    assert table.word_at_time(99.0) == 2
+
+
+def test_time_at_char_boundaries():
+    table = make_table(ROWS)
+    assert table.time_at_char(0) == 0.0
+    assert table.time_at_char(3) == 0.0
+    assert table.time_at_char(4) == 0.3
+    assert table.time_at_char(13) == 0.8
+    assert table.time_at_char(1000) == 0.8
+
+
+def test_lookups_ignore_rows_past_count():
+    table = make_table(ROWS)
+    table.count = 2
+    assert table.word_at_time(5.0) == 1
+    assert table.time_at_char(12) == 0.3
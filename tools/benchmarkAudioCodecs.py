@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+# Benchmark the audio cache codecs: size relative to raw PCM and encode/decode speed.
+# Usage: python benchmarkAudioCodecs.py [speech.wav ...]
+# With no files a synthetic voiced/unvoiced signal is used; real speech recordings give truer numbers.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pyReadAloud import AUDIO_CODECS
+
+def load_wav(path):
+    with wave.open(path, 'rb') as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit WAV files are supported")
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        if wav.getnchannels() > 1:
+            samples = samples.reshape(-1, wav.getnchannels()).mean(axis=1).astype(np.int16)
+        return samples.tobytes(), wav.getframerate()
+
+def synthetic_speech(seconds=30, sample_rate=22050):
+    rng = np.random.default_rng(0)
+    t = np.arange(seconds * sample_rate) / sample_rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    voiced = np.sin(2 * np.pi * np.cumsum(pitch) / sample_rate) * 6000
+    syllables = (np.sin(2 * np.pi * 4 * t) > -0.3) * (np.sin(2 * np.pi * 0.4 * t) > -0.8)
+    samples = voiced * syllables + rng.normal(0, 150, len(t))
+    return samples.astype(np.int16).tobytes(), sample_rate
+
+def benchmark(name, audio_bytes, sample_rate, repeats=3):
+    seconds = len(audio_bytes) / 2 / sample_rate
+    print(f"\n{name}: {seconds:.1f}s at {sample_rate} Hz, {len(audio_bytes) / 1024:.0f} KB raw")
+    print(f"{'codec':<8}{'size':>8}{'encode x realtime':>20}{'decode x realtime':>20}{'max error':>12}")
+    original = np.frombuffer(audio_bytes, dtype=np.int16)
+    for codec_name, codec in AUDIO_CODECS.items():
+        encode = decode = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            payload = codec.encode(audio_bytes, sample_rate)
+            encode = min(encode, time.perf_counter() - start)
+            start = time.perf_counter()
+            decoded = b''.join(codec.decode(memoryview(payload), sample_rate))
+            decode = min(decode, time.perf_counter() - start)
+        decoded = np.frombuffer(decoded, dtype=np.int16)
+        error = np.abs(decoded[:len(original)].astype(np.int32) - original[:len(decoded)]).max()
+        print(f"{codec_name:<8}{len(payload) / len(audio_bytes):>8.1%}{seconds / encode:>20.0f}{seconds / decode:>20.0f}{error:>12}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            benchmark(os.path.basename(path), *load_wav(path))
+    else:
+        benchmark('synthetic speech', *synthetic_speech())